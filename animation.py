@@ -0,0 +1,135 @@
+# Frame-driven animations. Instead of looping with pygame.time.delay, an
+# animation is a small object that the Animator advances once per frame
+# from the game loop, so input and rendering keep running while it plays.
+
+
+# Easing functions map linear progress t in [0, 1] to eased progress
+def linear(t):
+    return t
+
+
+def ease_in_out_quad(t):
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+# Base class: subclasses implement update(). on_complete runs only when the
+# animation reaches its end (naturally or through finish()); on_stop runs
+# whenever it ends, including cancel(), and should undo any visual state.
+class Animation:
+    def __init__(self, on_complete=None, on_stop=None, tag=None):
+        self.on_complete = on_complete
+        self.on_stop = on_stop
+        self.tag = tag
+        self.done = False
+
+    # Advance by dt milliseconds; returns True once the animation has ended
+    def step(self, dt):
+        raise NotImplementedError
+
+    def _end(self, completed):
+        if self.done:
+            return
+        self.done = True
+        if self.on_stop:
+            self.on_stop()
+        if completed and self.on_complete:
+            self.on_complete()
+
+    def finish(self):
+        self._end(True)
+
+    def cancel(self):
+        self._end(False)
+
+
+# Calls on_update(eased_t) every frame for `duration` milliseconds
+class Tween(Animation):
+    def __init__(self, duration, on_update, easing=linear, **kwargs):
+        super().__init__(**kwargs)
+        self.duration = duration
+        self.on_update = on_update
+        self.easing = easing
+        self.elapsed = 0
+
+    def step(self, dt):
+        if self.done:
+            return True
+        self.elapsed = min(self.elapsed + dt, self.duration)
+        t = self.elapsed / self.duration if self.duration else 1.0
+        self.on_update(self.easing(t))
+        if t >= 1.0:
+            self._end(True)
+        return self.done
+
+    def finish(self):
+        if not self.done:
+            self.on_update(self.easing(1.0))
+        super().finish()
+
+
+# Runs child animations one after another
+class Sequence(Animation):
+    def __init__(self, children, **kwargs):
+        super().__init__(**kwargs)
+        self.children = list(children)
+
+    def step(self, dt):
+        while self.children and not self.done:
+            if not self.children[0].step(dt):
+                return False
+            self.children.pop(0)
+            dt = 0
+        self._end(True)
+        return True
+
+    def finish(self):
+        while self.children:
+            self.children.pop(0).finish()
+        super().finish()
+
+    def cancel(self):
+        if self.children:
+            self.children[0].cancel()  # later children have not started yet
+            self.children.clear()
+        super().cancel()
+
+
+# Owns the running animations; main() calls tick() once per frame
+class Animator:
+    def __init__(self):
+        self._animations = []
+        self._last_tick = None
+
+    def add(self, animation):
+        self._animations.append(animation)
+        return animation
+
+    @property
+    def busy(self):
+        return bool(self._animations)
+
+    def tick(self, now):
+        dt = 0 if self._last_tick is None else now - self._last_tick
+        self._last_tick = now
+        for animation in list(self._animations):
+            if animation.step(dt) and animation in self._animations:
+                self._animations.remove(animation)
+
+    def _take(self, tag):
+        taken = [a for a in self._animations if tag is None or a.tag == tag]
+        self._animations = [a for a in self._animations if a not in taken]
+        return taken
+
+    # Jump the running animations (or those with `tag`) to their end state
+    def finish(self, tag=None):
+        for animation in self._take(tag):
+            animation.finish()
+
+    # Stop the running animations (or those with `tag`) without completing them
+    def cancel(self, tag=None):
+        for animation in self._take(tag):
+            animation.cancel()
@@ -0,0 +1,169 @@
+# Single-file asset archive.
+#
+# Layout:
+#   b'ZPAK'  magic
+#   u16      format version
+#   u16      reserved
+#   u32      length of the index in bytes
+#   index    UTF-8 JSON: {name: [offset, length, type]}, offsets relative to the data section
+#   data     the files, back to back
+#
+# On desktop the archive is memory-mapped and every asset is handed to
+# pygame.image.load / pygame.mixer.Sound as a file-like view onto the mapping,
+# so a whole bundle is one open() and no per-file copies. Where mmap is not
+# available (e.g. the browser build) the archive is read into memory once.
+import io
+import json
+import struct
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+MAGIC = b'ZPAK'
+VERSION = 1
+_HEADER = struct.Struct('<4sHHI')
+
+
+# Write `entries` (an iterable of (name, data, type)) to an archive at `path`
+def write_pack(path, entries):
+    index = {}
+    chunks = []
+    offset = 0
+    for name, data, kind in entries:
+        index[name] = [offset, len(data), kind]
+        chunks.append(data)
+        offset += len(data)
+    index_bytes = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    with open(path, 'wb') as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, 0, len(index_bytes)))
+        file.write(index_bytes)
+        for data in chunks:
+            file.write(data)
+    return offset + _HEADER.size + len(index_bytes)
+
+
+# Read-only, seekable file object over one asset inside the archive
+class PackFile(io.RawIOBase):
+    def __init__(self, view, name):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+        self.name = name
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), len(self._view) - self._pos)
+        if size <= 0:
+            return 0
+        buffer[:size] = self._view[self._pos:self._pos + size]
+        self._pos += size
+        return size
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if position < 0:
+            raise ValueError("negative seek position")
+        self._pos = position
+        return position
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        self._view = memoryview(b'')
+        super().close()
+
+
+class AssetPack:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if mmap else None
+        except (OSError, ValueError):
+            self._data = None
+        if self._data is None:
+            self._data = self._file.read()
+            self._file.close()
+            self._file = None
+        self._buffer = memoryview(self._data)
+        try:
+            self._read_index()
+        except (ValueError, TypeError, struct.error):
+            self.close()
+            raise
+
+    # Check the header and load the index; every entry must lie inside the file
+    def _read_index(self):
+        magic, version, _, index_length = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not an asset pack")
+        if version != VERSION:
+            raise ValueError(f"{self.path} has unsupported pack version {version}")
+        start = _HEADER.size
+        if start + index_length > len(self._buffer):
+            raise ValueError(f"{self.path} is truncated inside its index")
+        index = json.loads(bytes(self._buffer[start:start + index_length]).decode('utf-8'))
+        self._data_start = start + index_length
+        data_length = len(self._buffer) - self._data_start
+        if not isinstance(index, dict):
+            raise ValueError(f"{self.path} has a malformed index")
+        for name, entry in index.items():
+            offset, length, _ = entry
+            if offset < 0 or length < 0 or offset + length > data_length:
+                raise ValueError(f"{self.path} is truncated: {name} lies past the end of the file")
+        self._index = index
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def names(self):
+        return list(self._index)
+
+    def type(self, name):
+        return self._index[name][2]
+
+    # Zero-copy view of one asset's bytes
+    def view(self, name):
+        offset, length, _ = self._index[name]
+        start = self._data_start + offset
+        return self._buffer[start:start + length]
+
+    def open(self, name):
+        return PackFile(self.view(name), name)
+
+    def close(self):
+        self._buffer.release()
+        if self._file is not None:
+            self._data.close()
+            self._file.close()
+            self._file = None
+
+
+# Open the archive at `path`, or return None if there is none or it cannot be
+# read, so the caller falls back to the manifest or the loose files
+def open_pack(path):
+    try:
+        return AssetPack(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, struct.error) as error:
+        print(f"Not using asset pack {path}: {error}")
+        return None
@@ -0,0 +1,261 @@
+import asyncio
+import json
+import os
+from collections import OrderedDict
+
+import pygame
+
+
+# Images and sounds for one category, loaded on first use
+class CategoryAssets:
+    def __init__(self, name, image_paths, sound_paths, prompt_path, image_size, pinned):
+        self.name = name
+        self.image_paths = image_paths
+        self.sound_paths = sound_paths
+        self.prompt_path = prompt_path
+        self.image_size = image_size
+        self.pinned = pinned
+        self.images = {}
+        self.sounds = {}
+        self.prompt = None
+        self.images_loaded = False
+        self.sounds_loaded = False
+        self.image_bytes = 0
+        self.sound_bytes = 0
+
+    @property
+    def loaded(self):
+        return self.images_loaded or self.sounds_loaded
+
+    @property
+    def memory_bytes(self):
+        return self.image_bytes + self.sound_bytes
+
+
+# Estimated decoded size of a Sound in the mixer's sample format
+def sound_bytes(sound):
+    mixer = pygame.mixer.get_init()
+    if not mixer:
+        return 0
+    frequency, sample_format, channels = mixer
+    return int(sound.get_length() * frequency * channels * (abs(sample_format) // 8))
+
+
+# Read a bundle manifest written by build_assets.py. Returns a dict mapping
+# each source path (with '/' separators) to its built file, or None when
+# there is no bundle.
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        return None
+    base = os.path.dirname(path)
+    return {source: os.path.join(base, entry['file']) for source, entry in manifest['assets'].items()}
+
+
+# Loads each category's images (through the sprite cache) and sounds only when
+# the category is used. Loaded categories are kept in LRU order and the least
+# recently used unpinned ones are evicted once the memory budget is exceeded.
+# Categories are pinned for good at registration (pinned=True) or for as long
+# as a caller needs them with pin()/unpin(), e.g. the one on screen.
+# Assets that fail to load are collected and reported once per category load.
+# Categories registered with register_lazy() are only defined when first used.
+class AssetManager:
+    def __init__(self, sprites, budget_bytes=64 * 1024 * 1024, manifest=None, pack=None, verbose=True):
+        self.sprites = sprites
+        self.budget_bytes = budget_bytes
+        self.manifest = manifest
+        self.pack = pack
+        self.verbose = verbose
+        self._categories = {}
+        self._pending = {}
+        self._lru = OrderedDict()
+        self._pins = {}  # name -> pin() calls not yet matched by unpin()
+        self._loading = {}  # name -> task streaming the category in (see load_async)
+        self.missing = []
+        self._reported = set()
+        self.evictions = 0
+
+    def register(self, name, images=None, sounds=None, prompt=None, image_size=None, pinned=False):
+        self._pending.pop(name, None)
+        self._categories[name] = CategoryAssets(name, dict(images or {}), dict(sounds or {}), prompt, image_size, pinned)
+
+    # `define` returns register()'s keyword arguments; it is called on first use
+    def register_lazy(self, name, define):
+        self._categories.pop(name, None)
+        self._pending[name] = define
+
+    def __contains__(self, name):
+        return name in self._categories or name in self._pending
+
+    def names(self):
+        return list(self._categories) + list(self._pending)
+
+    # The file to actually open for a source asset path
+    def resolve(self, path):
+        if self.manifest is None:
+            return path
+        return self.manifest.get(path.replace(os.sep, '/'), path)
+
+    # Sprite-cache key and loader for a source image path; packed assets are
+    # read through a view onto the archive instead of their own file
+    def _image_source(self, path):
+        name = path.replace(os.sep, '/')
+        if self.pack is not None and name in self.pack:
+            return f'{self.pack.path}:{name}', lambda: pygame.image.load(self.pack.open(name), name)
+        return self.resolve(path), None
+
+    def _open_sound(self, path):
+        name = path.replace(os.sep, '/')
+        if self.pack is not None and name in self.pack:
+            return pygame.mixer.Sound(file=self.pack.open(name))
+        return pygame.mixer.Sound(self.resolve(path))
+
+    def category(self, name):
+        if name in self._pending:
+            self.register(name, **self._pending[name]())
+        return self._categories[name]
+
+    def is_loaded(self, name):
+        return name in self._categories and self._categories[name].loaded
+
+    # Make sure a category is loaded and mark it most recently used
+    def load(self, name):
+        for _ in self._load_steps(name):
+            pass
+        return self.category(name)
+
+    # Same as load(), but yields to the event loop after every file so the
+    # page (or the game loop) stays responsive while a category streams in.
+    # on_step() is called after each file, e.g. to advance a progress bar.
+    # There is at most one load in flight per category: a second caller (a
+    # click on a category the prefetch is still loading) waits for the first
+    # instead of decoding every file again.
+    async def load_async(self, name, on_step=None):
+        task = self._loading.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._stream(name, on_step))
+            self._loading[name] = task
+            task.add_done_callback(lambda _: self._loading.pop(name, None))
+        await asyncio.shield(task)  # A cancelled waiter does not cancel the load for the others
+        return self.category(name)
+
+    async def _stream(self, name, on_step):
+        for _ in self._load_steps(name):
+            if on_step is not None:
+                on_step()
+            await asyncio.sleep(0)
+
+    # Number of files load() would still read for a category
+    def pending_files(self, name):
+        category = self.category(name)
+        count = 0
+        if not category.images_loaded:
+            count += len(category.image_paths)
+        if not category.sounds_loaded and pygame.mixer.get_init():
+            count += len(category.sound_paths) + (1 if category.prompt_path else 0)
+        return count
+
+    # Start loading categories in a background task; returns the task
+    def prefetch(self, *names):
+        async def run():
+            for name in names:
+                await self.load_async(name)
+        return asyncio.ensure_future(run())
+
+    def _load_steps(self, name):
+        category = self.category(name)
+        missing = []
+        if not category.images_loaded:
+            for key, path in category.image_paths.items():
+                try:
+                    cache_key, load = self._image_source(path)
+                    category.images[key] = self.sprites.get(cache_key, category.image_size, load)
+                except (FileNotFoundError, pygame.error):
+                    missing.append(path)
+                yield
+            category.image_bytes = sum(s.get_pitch() * s.get_height() for s in category.images.values())
+            category.images_loaded = True
+        if not category.sounds_loaded and pygame.mixer.get_init():
+            paths = list(category.sound_paths.items())
+            if category.prompt_path:
+                paths.append((None, category.prompt_path))
+            for key, path in paths:
+                if (category.prompt if key is None else category.sounds.get(key)) is not None:
+                    continue  # Already decoded by a load() that ran while this one was streaming
+                try:
+                    sound = self._open_sound(path)
+                except (FileNotFoundError, pygame.error):
+                    missing.append(path)
+                    yield
+                    continue
+                if key is None:
+                    category.prompt = sound
+                else:
+                    category.sounds[key] = sound
+                yield
+            # Counted once the category is complete, from what it actually holds
+            sounds = list(category.sounds.values()) + ([category.prompt] if category.prompt else [])
+            category.sound_bytes = sum(sound_bytes(sound) for sound in sounds)
+            category.sounds_loaded = True
+        self._lru[name] = True
+        self._lru.move_to_end(name)
+        self._report_missing(name, missing)
+        self._enforce_budget(keep=name)
+
+    def _report_missing(self, name, missing):
+        new = [path for path in missing if path not in self._reported]
+        if new:
+            self._reported.update(new)
+            self.missing.extend(new)
+            if self.verbose:
+                print(f"Missing assets for '{name}' ({len(new)}): {', '.join(new)}")
+
+    def unload(self, name):
+        category = self._categories[name]
+        for path in category.image_paths.values():
+            self.sprites.discard(self._image_source(path)[0])
+        category.images.clear()
+        category.sounds.clear()
+        category.prompt = None
+        category.images_loaded = category.sounds_loaded = False
+        category.image_bytes = category.sound_bytes = 0
+        self._lru.pop(name, None)
+
+    # Keep a category loaded until the matching unpin(), whatever the budget.
+    # Pins nest; the category can be evicted again once every pin is released.
+    def pin(self, name):
+        self._pins[name] = self._pins.get(name, 0) + 1
+
+    def unpin(self, name):
+        count = self._pins.get(name, 0) - 1
+        if count > 0:
+            self._pins[name] = count
+        else:
+            self._pins.pop(name, None)
+            self._enforce_budget(keep=None)
+
+    def is_pinned(self, name):
+        return name in self._pins or (name in self._categories and self._categories[name].pinned)
+
+    def _enforce_budget(self, keep):
+        for name in list(self._lru):
+            if self.memory_bytes() <= self.budget_bytes:
+                break
+            if name != keep and name not in self._loading and not self.is_pinned(name):
+                self.unload(name)
+                self.evictions += 1
+
+    def memory_bytes(self):
+        return sum(category.memory_bytes for category in self._categories.values())
+
+    def stats(self):
+        return {
+            'loaded': list(self._lru),
+            'memory_bytes': self.memory_bytes(),
+            'budget_bytes': self.budget_bytes,
+            'pinned': sorted(self._pins),
+            'evictions': self.evictions,
+            'missing': len(self.missing),
+        }
@@ -0,0 +1,165 @@
+from collections import deque
+
+import pygame
+
+# Lanes, lowest priority first. A lane with higher priority stops anything
+# playing on lower lanes; lower lanes wait until higher ones are idle.
+PROMPT = 0
+FEEDBACK = 1
+
+# Posted by the mixer when a sequencer channel finishes (event.code is the channel id)
+AUDIO_END_EVENT = pygame.event.custom_type()
+
+
+class _Lane:
+    def __init__(self, channel):
+        self.channel = channel
+        self.queue = deque()
+
+
+# Plays queued sound sequences on dedicated mixer channels. Progress is driven
+# by Channel.set_endevent(), so the game loop only has to pass its events to
+# handle_event(); nothing ever waits for a sound to finish.
+class AudioSequencer:
+    def __init__(self, priorities=(PROMPT, FEEDBACK)):
+        self.priorities = sorted(priorities)
+        self._lanes = None
+
+    # Channels are created lazily, once the mixer has been initialised
+    def _ready(self):
+        if self._lanes is not None:
+            return True
+        if not pygame.mixer.get_init():
+            return False
+        pygame.mixer.set_reserved(len(self.priorities))
+        self._lanes = {}
+        for channel_id, priority in enumerate(self.priorities):
+            channel = pygame.mixer.Channel(channel_id)
+            channel.set_endevent(AUDIO_END_EVENT)
+            self._lanes[priority] = _Lane(channel)
+        return True
+
+    # Replace the lane's queue with `sounds` (None entries are skipped).
+    # Lower-priority lanes are stopped and cleared.
+    def play(self, sounds, priority=PROMPT):
+        sounds = [sound for sound in sounds if sound is not None]
+        if not sounds or not self._ready():
+            return
+        for other, lane in self._lanes.items():
+            if other < priority:
+                self._stop(lane)
+        lane = self._lanes[priority]
+        self._stop(lane)
+        lane.queue.extend(sounds)
+        self._advance(priority)
+
+    def cancel(self, priority=None):
+        if self._lanes is None:
+            return
+        for other, lane in self._lanes.items():
+            if priority is None or other == priority:
+                self._stop(lane)
+
+    def busy(self, priority=None):
+        if self._lanes is None:
+            return False
+        return any((lane.queue or lane.channel.get_busy())
+                   for other, lane in self._lanes.items() if priority is None or other == priority)
+
+    # Returns True if the event belonged to the sequencer
+    def handle_event(self, event):
+        if event.type != AUDIO_END_EVENT or self._lanes is None:
+            return False
+        # Stops and replaced sounds post end events too; _advance() ignores
+        # them because it never starts a sound on a busy channel.
+        for priority in reversed(self.priorities):
+            self._advance(priority)
+        return True
+
+    def _advance(self, priority):
+        lane = self._lanes[priority]
+        if not lane.queue or lane.channel.get_busy():
+            return
+        if any(self._lanes[other].channel.get_busy() for other in self.priorities if other > priority):
+            return
+        lane.channel.play(lane.queue.popleft())
+
+    @staticmethod
+    def _stop(lane):
+        lane.queue.clear()
+        lane.channel.stop()
+
+
+# Voice categories of the Battleship effects: name -> (priority, voice limit)
+BATTLESHIP_VOICES = {
+    'miss': (0, 2),
+    'hit': (1, 2),
+    'sink': (2, 1),
+}
+
+
+# One-shot sound effects on a fixed pool of reserved mixer channels.
+#
+# Each category may only have `limit` voices sounding at once; a sound past
+# that limit is dropped. When every channel is busy, the new sound steals the
+# channel of the lowest-priority voice (the oldest one among equals), as long
+# as that voice's priority is not higher than its own; otherwise it is
+# dropped. play() never blocks and never starts a thread.
+class EffectPool:
+    def __init__(self, categories, channels=4, first_channel=0):
+        self.categories = categories
+        self.channel_count = channels
+        self.first_channel = first_channel
+        self._voices = None  # One [channel, category, started] per channel
+        self._started = 0
+        self.played = 0
+        self.dropped = 0
+        self.stolen = 0
+
+    # Channels are reserved lazily, once the mixer has been initialised
+    def _ready(self):
+        if self._voices is not None:
+            return True
+        if not pygame.mixer.get_init():
+            return False
+        needed = self.first_channel + self.channel_count
+        if pygame.mixer.get_num_channels() < needed:
+            pygame.mixer.set_num_channels(needed)
+        pygame.mixer.set_reserved(needed)
+        self._voices = [[pygame.mixer.Channel(channel_id), None, 0]
+                        for channel_id in range(self.first_channel, needed)]
+        return True
+
+    # Play `sound` as a voice of `category`; returns its channel, or None if it was dropped
+    def play(self, sound, category):
+        if sound is None or not self._ready():
+            return None
+        priority, limit = self.categories[category]
+        busy = [voice for voice in self._voices if voice[0].get_busy()]
+        if sum(1 for voice in busy if voice[1] == category) >= limit:
+            self.dropped += 1
+            return None
+        free = [voice for voice in self._voices if not voice[0].get_busy()]
+        if free:
+            voice = free[0]
+        else:
+            voice = min(busy, key=lambda voice: (self.categories[voice[1]][0], voice[2]))
+            if self.categories[voice[1]][0] > priority:
+                self.dropped += 1
+                return None
+            voice[0].stop()
+            self.stolen += 1
+        self._started += 1
+        voice[1] = category
+        voice[2] = self._started
+        voice[0].play(sound)
+        self.played += 1
+        return voice[0]
+
+    def stop(self):
+        if self._voices is not None:
+            for voice in self._voices:
+                voice[0].stop()
+
+    def stats(self):
+        return {'played': self.played, 'dropped': self.dropped, 'stolen': self.stolen}
@@ -0,0 +1,140 @@
+# Probability-density Battleship player.
+#
+# For every ship still afloat, every straight window of its length that does
+# not cross a miss or a sunk ship is a possible placement. Counting, for each
+# cell, how many possible placements cover it gives a heat map of where ships
+# are likely to be; the best shot is the unfired cell with the highest count.
+#
+# Hunt mode counts every placement. Once a ship has been hit but not sunk the
+# player switches to target mode and only counts placements through those
+# hits, weighted by how many of them they explain, so it finishes the ship off.
+#
+# The counting is a sliding-window sum over the miss/hit masks, vectorised
+# with NumPy when it is installed (pip install numpy) and done with plain
+# Python loops otherwise.
+import random
+from collections import Counter
+
+from battleship_board import iter_bits
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HUNT = 'hunt'
+TARGET = 'target'
+
+
+class DensityAI:
+    # Ties are broken with `rng`, the global random module by default
+    def __init__(self, rng=None):
+        self.rng = rng if rng is not None else random
+
+    # What the shooter knows: misses and sunk ships block placements, open hits attract them
+    @staticmethod
+    def knowledge(board):
+        sunk = 0
+        lengths = []
+        for ship, mask in enumerate(board.ship_masks):
+            if board.is_sunk(ship):
+                sunk |= mask
+            else:
+                lengths.append(board.ship_lengths[ship])
+        blocked = (board.shots & ~board.ships) | sunk
+        open_hits = board.hits & ~sunk
+        return blocked, open_hits, lengths
+
+    def mode(self, board):
+        return TARGET if self.knowledge(board)[1] else HUNT
+
+    # Placement counts per cell as a rows x cols array (a list of lists without
+    # NumPy); cells already fired at are 0
+    def heatmap(self, board):
+        blocked, open_hits, lengths = self.knowledge(board)
+        if np is not None:
+            return _heatmap_numpy(board, blocked, open_hits, lengths)
+        return _heatmap_python(board, blocked, open_hits, lengths)
+
+    # The unfired cell most likely to hold a ship, ties broken at random
+    def next_shot(self, board):
+        heat = self.heatmap(board)
+        if np is not None:
+            flat = heat.ravel()
+            best = flat.max()
+            if best > 0:
+                candidates = np.flatnonzero(flat == best)
+            else:
+                # No placement fits any more; any unfired cell will do
+                candidates = np.flatnonzero(~_to_array(board.shots, board).ravel())
+            return board.cell(int(candidates[self.rng.randrange(len(candidates))]))
+        best = max(max(row) for row in heat)
+        if best > 0:
+            candidates = [(r, c) for r, row in enumerate(heat) for c, value in enumerate(row) if value == best]
+        else:
+            candidates = [board.cell(index) for index in iter_bits(~board.shots & ((1 << board.size) - 1))]
+        return self.rng.choice(candidates)
+
+
+def _to_array(mask, board):
+    data = mask.to_bytes((board.size + 7) // 8, 'little')
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder='little')[:board.size]
+    return bits.reshape(board.rows, board.cols).astype(bool)
+
+
+# Sum of `values` over every window of `length` along axis 1; shape (rows, cols - length + 1)
+def _window_sums(values, length):
+    cumulative = np.zeros((values.shape[0], values.shape[1] + 1), dtype=np.int32)
+    np.cumsum(values, axis=1, out=cumulative[:, 1:])
+    return cumulative[:, length:] - cumulative[:, :-length]
+
+
+# Spread each window's weight back over the `length` cells it covers
+def _cover(weights, length, cols):
+    spread = np.zeros((weights.shape[0], cols + 1), dtype=np.float64)
+    spread[:, :weights.shape[1]] += weights
+    spread[:, length:length + weights.shape[1]] -= weights
+    return np.cumsum(spread, axis=1)[:, :cols]
+
+
+def _heatmap_numpy(board, blocked, open_hits, lengths):
+    blocked = _to_array(blocked, board).astype(np.int32)
+    hits = _to_array(open_hits, board).astype(np.int32)
+    target = bool(open_hits)
+    heat = np.zeros((board.rows, board.cols), dtype=np.float64)
+    # Ships of the same length have the same placements; count them once
+    for length, ships in Counter(lengths).items():
+        # Rows for horizontal ships, then the transposed board for vertical ones
+        for blocked_view, hits_view, transpose in ((blocked, hits, False), (blocked.T, hits.T, True)):
+            if length > blocked_view.shape[1] or (length == 1 and transpose):
+                continue
+            fits = _window_sums(blocked_view, length) == 0
+            if target:
+                weights = np.where(fits, _window_sums(hits_view, length), 0).astype(np.float64)
+            else:
+                weights = fits.astype(np.float64)
+            counts = _cover(weights * ships, length, blocked_view.shape[1])
+            heat += counts.T if transpose else counts
+    heat[_to_array(board.shots, board)] = 0
+    return heat
+
+
+def _heatmap_python(board, blocked, open_hits, lengths):
+    rows, cols = board.rows, board.cols
+    target = bool(open_hits)
+    heat = [[0] * cols for _ in range(rows)]
+    for length, ships in Counter(lengths).items():
+        directions = ((0, 1),) if length == 1 else ((0, 1), (1, 0))
+        for dr, dc in directions:
+            for row in range(rows - dr * (length - 1)):
+                for col in range(cols - dc * (length - 1)):
+                    cells = [(row + i * dr) * cols + col + i * dc for i in range(length)]
+                    if any(blocked >> index & 1 for index in cells):
+                        continue
+                    weight = (sum(open_hits >> index & 1 for index in cells) if target else 1) * ships
+                    if weight:
+                        for index in cells:
+                            heat[index // cols][index % cols] += weight
+    for index in iter_bits(board.shots):
+        heat[index // cols][index % cols] = 0
+    return heat
@@ -0,0 +1,268 @@
+# Bitboard Battleship board.
+#
+# Cell (row, col) is bit row * cols + col of a Python int, so a whole board of
+# any size is one integer: `ships` holds every ship cell, `shots` every cell
+# fired at and `hits` the shots that struck a ship. Each ship also keeps its
+# own occupancy mask, a cell -> ship table answers "whose cell is this", and
+# a per-ship counter of cells still afloat makes hit and sunk checks O(1).
+import random
+
+# Results of Board.fire()
+MISS = 'miss'
+HIT = 'hit'
+SUNK = 'sunk'
+REPEAT = 'repeat'  # The cell was already fired at
+
+
+class Board:
+    def __init__(self, rows, cols=None):
+        self.rows = rows
+        self.cols = rows if cols is None else cols
+        self.size = self.rows * self.cols
+        self.ships = 0
+        self.shots = 0
+        self.hits = 0
+        self.ship_masks = []
+        self.ship_lengths = []
+        self._afloat = []
+        self._owner = {}  # cell index -> ship id
+
+    # Bit index of a cell; cells off the board raise instead of aliasing into the next row
+    def index(self, row, col):
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise ValueError(f"Cell ({row}, {col}) is outside the {self.rows}x{self.cols} board")
+        return row * self.cols + col
+
+    def cell(self, index):
+        return divmod(index, self.cols)
+
+    def bit(self, row, col):
+        return 1 << self.index(row, col)
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    # Mask of a straight ship of `length` cells starting at (row, col), or None if it leaves the board
+    def ship_mask(self, row, col, length, horizontal):
+        if horizontal:
+            if not (0 <= row < self.rows and 0 <= col and col + length <= self.cols):
+                return None
+            return ((1 << length) - 1) << (row * self.cols + col)
+        if not (0 <= col < self.cols and 0 <= row and row + length <= self.rows):
+            return None
+        mask = 0
+        for i in range(length):
+            mask |= 1 << ((row + i) * self.cols + col)
+        return mask
+
+    def fits(self, mask):
+        return mask is not None and not mask & self.ships
+
+    # Add a ship covering `mask`; returns its id
+    def add_ship(self, mask):
+        if not mask or mask >> self.size:
+            raise ValueError("Ship lies outside the board")
+        if mask & self.ships:
+            raise ValueError("Ship overlaps another ship")
+        ship = len(self.ship_masks)
+        self.ships |= mask
+        self.ship_masks.append(mask)
+        length = 0
+        for index in iter_bits(mask):
+            self._owner[index] = ship
+            length += 1
+        self.ship_lengths.append(length)
+        self._afloat.append(length)
+        return ship
+
+    def fire(self, row, col):
+        index = self.index(row, col)
+        bit = 1 << index
+        if self.shots & bit:
+            return REPEAT
+        self.shots |= bit
+        if not self.ships & bit:
+            return MISS
+        self.hits |= bit
+        ship = self._owner[index]
+        self._afloat[ship] -= 1
+        return SUNK if self._afloat[ship] == 0 else HIT
+
+    def is_shot(self, row, col):
+        return bool(self.shots >> self.index(row, col) & 1)
+
+    def is_ship(self, row, col):
+        return bool(self.ships >> self.index(row, col) & 1)
+
+    def is_hit(self, row, col):
+        return bool(self.hits >> self.index(row, col) & 1)
+
+    # Id of the ship on a cell, or None
+    def ship_at(self, row, col):
+        return self._owner.get(self.index(row, col))
+
+    def is_sunk(self, ship):
+        return self._afloat[ship] == 0
+
+    @property
+    def ship_count(self):
+        return len(self.ship_masks)
+
+    @property
+    def ships_sunk(self):
+        return self._afloat.count(0)
+
+    @property
+    def all_sunk(self):
+        return self.ships == self.hits
+
+    # Ship cells that have not been hit yet, as (row, col)
+    def remaining_cells(self):
+        return [self.cell(index) for index in iter_bits(self.ships & ~self.hits)]
+
+    def cells(self, mask):
+        return [self.cell(index) for index in iter_bits(mask)]
+
+
+# Indices of the set bits of `mask`, lowest first
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class PlacementError(ValueError):
+    pass
+
+
+# Candidate placements of one ship length, as ids: start cell * 2 + (1 if vertical).
+# `alive` holds the ids that still fit; `blocks` counts the blocked cells (or
+# exclusions) covering each id, so blocking and unblocking are exact inverses.
+class _Placements:
+    def __init__(self, rows, cols, length):
+        self.rows = rows
+        self.cols = cols
+        self.length = length
+        self.blocks = [1] * (rows * cols * 2)
+        self.alive = []
+        self.position = {}
+        for row in range(rows):
+            for col in range(cols):
+                start = (row * cols + col) << 1
+                if col + length <= cols:
+                    self._add(start)
+                if length > 1 and row + length <= rows:
+                    self._add(start | 1)
+
+    def _add(self, id):
+        self.blocks[id] = 0
+        self.position[id] = len(self.alive)
+        self.alive.append(id)
+
+    def hold(self, id):
+        self.blocks[id] += 1
+        if self.blocks[id] == 1:
+            index = self.position.pop(id)
+            last = self.alive.pop()
+            if last != id:
+                self.alive[index] = last
+                self.position[last] = index
+
+    def release(self, id):
+        self.blocks[id] -= 1
+        if self.blocks[id] == 0:
+            self.position[id] = len(self.alive)
+            self.alive.append(id)
+
+    # Ids of the placements that cover cell `index`
+    def covering(self, index):
+        row, col = divmod(index, self.cols)
+        length = self.length
+        for start_col in range(max(0, col - length + 1), min(col, self.cols - length) + 1):
+            yield (row * self.cols + start_col) << 1
+        if length > 1:
+            for start_row in range(max(0, row - length + 1), min(row, self.rows - length) + 1):
+                yield ((start_row * self.cols + col) << 1) | 1
+
+    def mask(self, board, id):
+        row, col = divmod(id >> 1, self.cols)
+        return board.ship_mask(row, col, self.length, not id & 1)
+
+
+# Mask plus every cell touching it, diagonals included
+def _surroundings(board, mask):
+    column = sum(1 << (row * board.cols) for row in range(board.rows))
+    full = (1 << board.size) - 1
+    spread = mask | (mask << 1 & ~column & full) | (mask >> 1 & ~(column << (board.cols - 1)))
+    return (spread | spread << board.cols | spread >> board.cols) & full
+
+
+# Place a fleet of ships with the given lengths at random on `board`.
+#
+# Placements are drawn only from those that still fit, so there is no
+# rejection loop. When a ship has nowhere left to go, the search backtracks
+# and excludes the previous ship's position. With no_touch=True, ships may not
+# share an edge or a corner with each other or with ships already on the board.
+# Raises PlacementError when the fleet cannot fit, or when no layout was found
+# within `max_backtracks` steps. Returns the new ship ids. Without a seed or
+# an rng the global random module is used, so random.seed() fixes the layout.
+def place_fleet(board, lengths, seed=None, no_touch=False, rng=None, max_backtracks=2000):
+    if rng is None:
+        rng = random.Random(seed) if seed is not None else random
+    lengths = sorted(lengths, reverse=True)  # Longest first; equal lengths end up next to each other
+    free = board.size - bin(board.ships).count('1')
+    if any(length < 1 for length in lengths):
+        raise PlacementError("Ship lengths must be at least 1")
+    if sum(lengths) > free:
+        raise PlacementError(f"A fleet of {sum(lengths)} cells cannot fit in {free} free cells")
+    pools = {length: _Placements(board.rows, board.cols, length) for length in set(lengths)}
+
+    def block(cells):
+        for index in iter_bits(cells):
+            for pool in pools.values():
+                for id in pool.covering(index):
+                    pool.hold(id)
+
+    def unblock(cells):
+        for index in iter_bits(cells):
+            for pool in pools.values():
+                for id in pool.covering(index):
+                    pool.release(id)
+
+    blocked = _surroundings(board, board.ships) if no_touch else board.ships
+    block(blocked)
+    placed = []  # (pool, id, cells newly blocked by it)
+    excluded = [[] for _ in lengths]  # Placements already tried and failed at each depth
+    backtracks = 0
+    depth = 0
+    while depth < len(lengths):
+        pool = pools[lengths[depth]]
+        if pool.alive:
+            id = pool.alive[rng.randrange(len(pool.alive))]
+            mask = pool.mask(board, id)
+            area = _surroundings(board, mask) if no_touch else mask
+            new = area & ~blocked
+            blocked |= new
+            block(new)
+            placed.append((pool, id, new))
+            depth += 1
+            continue
+        # Dead end: undo the previous ship and rule out the position it had.
+        # Ships of equal length are interchangeable, so a position that failed
+        # for one cannot work for a later one either.
+        for id in excluded[depth]:
+            pool.release(id)
+        excluded[depth] = []
+        if depth == 0:
+            raise PlacementError(f"No layout fits ships of lengths {lengths} on a {board.rows}x{board.cols} board")
+        backtracks += 1
+        if backtracks > max_backtracks:
+            raise PlacementError(f"Gave up placing ships of lengths {lengths} after {max_backtracks} backtracks")
+        depth -= 1
+        pool, id, new = placed.pop()
+        unblock(new)
+        blocked &= ~new
+        pool.hold(id)
+        excluded[depth].append(id)
+    return [board.add_ship(pool.mask(board, id)) for pool, id, _ in placed]
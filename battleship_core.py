@@ -0,0 +1,68 @@
+# Battleship rules without any UI: a board with a placed fleet, a turn limit
+# that only misses count against, and the game result. game.py's Tk and
+# pygame front ends and the headless simulator (battleship_sim.py) all play
+# through this class.
+from battleship_board import MISS, REPEAT, SUNK, Board, place_fleet
+
+PLAYING = 'playing'
+WON = 'won'
+LOST = 'lost'
+
+DEFAULT_SIZE = 5
+DEFAULT_FLEET = (3, 3, 3)
+DEFAULT_TURNS = 7
+
+
+class GameOver(Exception):
+    pass
+
+
+class BattleshipGame:
+    # turns=None plays without a turn limit; `seed` fixes the fleet layout
+    def __init__(self, size=DEFAULT_SIZE, fleet=DEFAULT_FLEET, turns=DEFAULT_TURNS, seed=None, no_touch=False):
+        self.size = size
+        self.fleet = tuple(fleet)
+        self.turns = turns
+        self.board = Board(size)
+        place_fleet(self.board, self.fleet, seed=seed, no_touch=no_touch)
+        self.turns_left = turns
+        self.shots = 0
+        self.misses = 0
+        self.sink_shots = []  # Shot number at which each ship went down
+        self.status = PLAYING
+
+    @property
+    def over(self):
+        return self.status != PLAYING
+
+    @property
+    def won(self):
+        return self.status == WON
+
+    # Only misses use up turns
+    @property
+    def turns_used(self):
+        return self.misses
+
+    # Fire at a cell and return MISS, HIT, SUNK or REPEAT (which costs nothing)
+    def fire(self, row, col):
+        if self.over:
+            raise GameOver(f"The game is over ({self.status})")
+        result = self.board.fire(row, col)
+        if result == REPEAT:
+            return result
+        self.shots += 1
+        if result == MISS:
+            self.misses += 1
+            if self.turns is not None:
+                self.turns_left -= 1
+                if self.turns_left == 0:
+                    self.status = LOST
+        elif result == SUNK:
+            self.sink_shots.append(self.shots)
+            if self.board.all_sunk:
+                self.status = WON
+        return result
+
+    def remaining_cells(self):
+        return self.board.remaining_cells()
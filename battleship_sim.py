@@ -0,0 +1,197 @@
+# Headless Battleship simulator.
+#
+# Plays many games per strategy through battleship_core and aggregates turns
+# used, win rate under the turn limit and the distribution of shots at which
+# ships were sunk. Games are split into chunks across a ProcessPoolExecutor,
+# so throughput grows with the number of cores. Game i of a batch always uses
+# the same fleet layout for a given --seed, so strategies are compared on
+# identical boards and runs are reproducible.
+#
+#   python battleship_sim.py --games 100000 --strategy all
+#   python battleship_sim.py --games 20000 --size 8 --fleet 4 3 3 2 --turns 20 --json results.json
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from battleship_ai import DensityAI
+from battleship_board import HIT, SUNK, iter_bits
+from battleship_core import DEFAULT_FLEET, DEFAULT_SIZE, DEFAULT_TURNS, BattleshipGame
+
+
+# Fires at a random unfired cell
+class RandomStrategy:
+    def __init__(self, rng):
+        self.rng = rng
+
+    def next_shot(self, board):
+        unfired = list(iter_bits(~board.shots & ((1 << board.size) - 1)))
+        return board.cell(self.rng.choice(unfired))
+
+    def observe(self, board, row, col, result):
+        pass
+
+
+# Hunts on a checkerboard until it hits, then tries the neighbours of every
+# hit that does not belong to a sunk ship
+class HuntTargetStrategy(RandomStrategy):
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.targets = []
+
+    def next_shot(self, board):
+        while self.targets:
+            row, col = self.targets.pop()
+            if not board.is_shot(row, col):
+                return row, col
+        unfired = ~board.shots & ((1 << board.size) - 1)
+        parity = [index for index in iter_bits(unfired) if sum(board.cell(index)) % 2 == 0]
+        return board.cell(self.rng.choice(parity or list(iter_bits(unfired))))
+
+    def observe(self, board, row, col, result):
+        if result == HIT:
+            self._add_neighbours(board, row, col)
+        elif result == SUNK:
+            # Keep chasing hits that belong to ships still afloat
+            self.targets = []
+            for index in iter_bits(DensityAI.knowledge(board)[1]):
+                self._add_neighbours(board, *board.cell(index))
+
+    def _add_neighbours(self, board, row, col):
+        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            if board.in_bounds(row + dr, col + dc) and not board.is_shot(row + dr, col + dc):
+                self.targets.append((row + dr, col + dc))
+
+
+class DensityStrategy(DensityAI):
+    def observe(self, board, row, col, result):
+        pass
+
+
+STRATEGIES = {
+    'random': RandomStrategy,
+    'hunt_target': HuntTargetStrategy,
+    'density': DensityStrategy,
+}
+
+
+# Statistics of a batch of games; chunks are merged with add()
+class BatchStats:
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.shots = 0
+        self.turns_used = Counter()
+        self.shots_to_win = Counter()
+        self.shots_to_sink = Counter()
+
+    def record(self, game):
+        self.games += 1
+        self.wins += game.won
+        self.shots += game.shots
+        self.turns_used[game.turns_used] += 1
+        if game.won:
+            self.shots_to_win[game.shots] += 1
+        self.shots_to_sink.update(game.sink_shots)
+
+    def add(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.shots += other.shots
+        self.turns_used.update(other.turns_used)
+        self.shots_to_win.update(other.shots_to_win)
+        self.shots_to_sink.update(other.shots_to_sink)
+
+    def summary(self):
+        return {
+            'games': self.games,
+            'win_rate': self.wins / self.games if self.games else 0.0,
+            'mean_shots': self.shots / self.games if self.games else 0.0,
+            'mean_turns_used': _mean(self.turns_used),
+            'mean_shots_to_win': _mean(self.shots_to_win),
+            'turns_used': _distribution(self.turns_used),
+            'shots_to_win': _distribution(self.shots_to_win),
+            'shots_to_sink': _distribution(self.shots_to_sink),
+        }
+
+
+def _mean(counter):
+    total = sum(counter.values())
+    return sum(value * count for value, count in counter.items()) / total if total else 0.0
+
+
+def _distribution(counter):
+    return {str(value): counter[value] for value in sorted(counter)}
+
+
+# Play one game to the end; the layout depends only on (seed, game), the
+# strategy's random choices also on the strategy
+def play_game(strategy_name, settings, seed, game_index):
+    game = BattleshipGame(settings['size'], settings['fleet'], settings['turns'], seed=f'{seed}:{game_index}',
+                          no_touch=settings['no_touch'])
+    strategy = STRATEGIES[strategy_name](random.Random(f'{seed}:{game_index}:{strategy_name}'))
+    board = game.board
+    while not game.over:
+        row, col = strategy.next_shot(board)
+        strategy.observe(board, row, col, game.fire(row, col))
+    return game
+
+
+def play_chunk(strategy_name, settings, seed, start, count):
+    stats = BatchStats()
+    for game_index in range(start, start + count):
+        stats.record(play_game(strategy_name, settings, seed, game_index))
+    return stats
+
+
+# Play `games` games with one strategy, spread over `workers` processes (1 runs in-process)
+def run_batch(strategy_name, games, settings, seed=0, workers=None, chunk_size=None):
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return play_chunk(strategy_name, settings, seed, 0, games)
+    chunk_size = chunk_size or max(1, min(5000, games // (workers * 4)))
+    stats = BatchStats()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_chunk, strategy_name, settings, seed, start, min(chunk_size, games - start))
+                   for start in range(0, games, chunk_size)]
+        for future in futures:
+            stats.add(future.result())
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate Battleship games headlessly')
+    parser.add_argument('--games', type=int, default=10000, help='games per strategy (default 10000)')
+    parser.add_argument('--strategy', choices=list(STRATEGIES) + ['all'], default='all')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help=f'board size (default {DEFAULT_SIZE})')
+    parser.add_argument('--fleet', type=int, nargs='+', default=list(DEFAULT_FLEET), help='ship lengths (default 3 3 3)')
+    parser.add_argument('--turns', type=int, default=DEFAULT_TURNS, help=f'misses allowed, 0 for no limit (default {DEFAULT_TURNS})')
+    parser.add_argument('--no-touch', action='store_true', help='ships may not touch each other')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, help='processes to use (default: all cores)')
+    parser.add_argument('--json', help='also write the full statistics here')
+    args = parser.parse_args()
+
+    settings = {'size': args.size, 'fleet': args.fleet, 'turns': args.turns or None, 'no_touch': args.no_touch}
+    strategies = list(STRATEGIES) if args.strategy == 'all' else [args.strategy]
+    results = {'settings': settings, 'seed': args.seed, 'strategies': {}}
+    print(f"{'strategy':12} {'games':>8} {'win rate':>9} {'turns used':>11} {'shots to win':>13} {'games/s':>9}")
+    for name in strategies:
+        start = time.perf_counter()
+        summary = run_batch(name, args.games, settings, args.seed, args.workers).summary()
+        elapsed = time.perf_counter() - start
+        results['strategies'][name] = summary
+        print(f"{name:12} {summary['games']:8} {summary['win_rate']:9.1%} {summary['mean_turns_used']:11.2f} "
+              f"{summary['mean_shots_to_win']:13.2f} {summary['games'] / elapsed:9.0f}")
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
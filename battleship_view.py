@@ -0,0 +1,128 @@
+# Retained rendering pieces for the pygame Battleship game.
+#
+# BoardView keeps the whole board pre-rendered on one surface and remembers
+# which ship and shot bits it last drew. sync() XORs those against the board's
+# bitboards and repaints only the cells that changed, so an idle frame costs a
+# couple of integer operations whatever the board size. Button keeps its
+# hover/pressed state from mouse events instead of polling the mouse while
+# drawing, and fires its action once per click (press and release on it).
+import pygame
+
+from battleship_board import iter_bits
+from fonts import get_font, render_text
+
+WATER_COLOR = (173, 216, 230)
+SHIP_COLOR = (0, 255, 0)
+SHOT_COLOR = (255, 0, 0)
+MARK_COLOR = (255, 255, 0)
+
+
+class BoardView:
+    # `origin` is the board's top-left corner on screen; cells start `margin` pixels in
+    def __init__(self, board, origin, cell_size, margin, background):
+        self.origin = origin
+        self.cell_size = cell_size
+        self.margin = margin
+        self.background = background
+        self.set_board(board)
+
+    # Start showing another board (e.g. after a restart); everything is redrawn
+    def set_board(self, board):
+        self.board = board
+        pitch = self.cell_size + self.margin
+        size = (board.cols * pitch + self.margin, board.rows * pitch + self.margin)
+        if getattr(self, 'surface', None) is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size).convert()
+        self.surface.fill(self.background)
+        self._ships = 0
+        self._shots = 0
+        for index in range(board.size):
+            self._draw_cell(index)
+        self._ships = board.ships
+        self._shots = board.shots
+
+    @property
+    def rect(self):
+        return self.surface.get_rect(topleft=self.origin)
+
+    # Cell (row, col) under a screen position, or None
+    def cell_at(self, pos):
+        pitch = self.cell_size + self.margin
+        col = (pos[0] - self.origin[0]) // pitch
+        row = (pos[1] - self.origin[1]) // pitch
+        return (row, col) if self.board.in_bounds(row, col) else None
+
+    # Screen rectangle of a cell
+    def cell_rect(self, row, col):
+        pitch = self.cell_size + self.margin
+        return pygame.Rect(self.origin[0] + col * pitch + self.margin, self.origin[1] + row * pitch + self.margin,
+                           self.cell_size, self.cell_size)
+
+    def _draw_cell(self, index):
+        row, col = self.board.cell(index)
+        pitch = self.cell_size + self.margin
+        rect = pygame.Rect(col * pitch + self.margin, row * pitch + self.margin, self.cell_size, self.cell_size)
+        bit = 1 << index
+        shot = self.board.shots & bit
+        color = SHOT_COLOR if shot else SHIP_COLOR if self.board.ships & bit else WATER_COLOR
+        self.surface.fill(self.background, rect)
+        pygame.draw.rect(self.surface, color, rect, border_radius=5)
+        if shot:
+            pygame.draw.circle(self.surface, MARK_COLOR, rect.center, 10)
+        return rect
+
+    # Repaint the cells whose state changed since the last call; returns
+    # their screen rectangles (empty when nothing changed)
+    def sync(self):
+        changed = (self.board.ships ^ self._ships) | (self.board.shots ^ self._shots)
+        if not changed:
+            return []
+        self._ships = self.board.ships
+        self._shots = self.board.shots
+        return [self._draw_cell(index).move(self.origin) for index in iter_bits(changed)]
+
+
+# Outline drawn around the hinted cell, on a transparent surface the size of the outline
+def hint_outline(cell_size, color=MARK_COLOR):
+    surface = pygame.Surface((cell_size + 8, cell_size + 8), pygame.SRCALPHA)
+    pygame.draw.rect(surface, color, surface.get_rect(), width=4, border_radius=7)
+    return surface
+
+
+class Button:
+    def __init__(self, text, rect, color, hover_color, action, text_color=(0, 0, 0), font_size=40):
+        self.rect = pygame.Rect(rect)
+        self.action = action
+        self.hovered = False
+        self.pressed = False
+        font = get_font(None, font_size)
+        text_surf = render_text(text, font, text_color)
+        self._images = []
+        for fill in (color, hover_color):
+            image = pygame.Surface(self.rect.size).convert()
+            image.fill(fill)
+            image.blit(text_surf, text_surf.get_rect(center=image.get_rect().center))
+            self._images.append(image)
+
+    # The face for the current state; the same surface object while the state is unchanged
+    @property
+    def image(self):
+        return self._images[self.hovered]
+
+    # Update hover/press from a mouse event; returns True if the event was a click on the button
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            self.hovered = self.rect.collidepoint(event.pos)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.hovered = self.rect.collidepoint(event.pos)
+            self.pressed = self.hovered
+            return self.pressed
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            clicked = self.pressed and self.rect.collidepoint(event.pos)
+            self.pressed = False
+            if clicked:
+                self.action()
+            return clicked
+        elif event.type == pygame.WINDOWLEAVE:
+            self.hovered = False
+        return False
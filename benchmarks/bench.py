@@ -0,0 +1,269 @@
+# Headless benchmark suite for zaid.py and game.py.
+#
+#   python benchmarks/bench.py run --out results.json
+#   python benchmarks/bench.py compare baseline.json results.json [--threshold 0.10]
+#
+# Every benchmark group runs in its own subprocess with SDL's dummy video and
+# audio drivers, so it works on a plain Linux box and one group cannot leak
+# state (or a pygame.quit()) into the next. Results hold the median and p95
+# of each metric, in milliseconds unless the metric names another unit (lower
+# is better for all of them); compare exits non-zero when a median got worse
+# than the baseline by more than the threshold.
+import argparse
+import importlib.metadata
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]  # nearest rank
+
+
+def summarize(samples, unit='ms'):
+    return {
+        'unit': unit,
+        'samples': len(samples),
+        'median': statistics.median(samples),
+        'p95': percentile(samples, 0.95),
+        'mean': statistics.fmean(samples),
+    }
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+# Benchmark groups. Each runs inside a child process and returns {metric: [samples in ms]}.
+
+def bench_startup(repeat):
+    results = {}
+    for module in ('zaid', 'game'):
+        samples = []
+        for _ in range(repeat):
+            code = f"import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+            output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=os.environ, check=True,
+                                    capture_output=True, text=True).stdout
+            samples.append(float(output.strip().splitlines()[-1]))
+        results[f'startup.import_{module}'] = samples
+    # zaid: until the loading screen is up (init()) and until the menu can be shown
+    code = ("import asyncio, time; t = time.perf_counter(); import zaid; zaid.init(); w = time.perf_counter(); "
+            "asyncio.run(zaid.load_menu()); m = time.perf_counter(); print((w - t) * 1000, (m - t) * 1000)")
+    window, menu = [], []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=os.environ, check=True,
+                                capture_output=True, text=True).stdout
+        first, second = output.strip().splitlines()[-1].split()
+        window.append(float(first))
+        menu.append(float(second))
+    results['startup.zaid_window'] = window
+    results['startup.zaid_menu'] = menu
+    return results
+
+
+# Open zaid's window and load what the menu needs, as zaid.main() does
+def start_zaid():
+    import asyncio
+    import zaid
+    zaid.init()
+    asyncio.run(zaid.load_menu())
+    return zaid
+
+
+def bench_draw_items(repeat):
+    zaid = start_zaid()
+    results = {}
+    for category in ('letters', 'numbers', 'who'):
+        zaid.current_category = category
+        zaid.draw_items()  # Build the scene and load the category
+        results[f'draw_items.{category}.idle'] = [timed(zaid.draw_items) for _ in range(repeat * 10)]
+        full = []
+        for _ in range(repeat * 10):
+            zaid.scene.invalidate()
+            full.append(timed(zaid.draw_items))
+        results[f'draw_items.{category}.full'] = full
+        results[f'draw_items.{category}.dancing'] = [timed(zaid.draw_items, True) for _ in range(repeat * 10)]
+        zaid.item_offsets.clear()
+    return results
+
+
+# Drive an animation to completion at a simulated 30 fps and return the wall time spent
+def run_animation(zaid, start):
+    now = 0
+    begin = time.perf_counter()
+    start()
+    while zaid.animator.busy:
+        now += 33
+        zaid.animator.tick(now)
+        zaid.draw_items()
+    return (time.perf_counter() - begin) * 1000
+
+
+def bench_animations(repeat):
+    zaid = start_zaid()
+    zaid.current_category = 'letters'
+    zaid.draw_items()
+    first, other = zaid.grid.rect(0), zaid.grid.rect(zaid.grid.count - 1)
+    return {
+        'animations.animate_correct_item': [run_animation(zaid, lambda: zaid.animate_correct_item(first)) for _ in range(repeat)],
+        'animations.animate_wrong_item': [run_animation(zaid, lambda: zaid.animate_wrong_item(first, other)) for _ in range(repeat)],
+        'animations.animate_dancing_items': [run_animation(zaid, zaid.animate_dancing_items) for _ in range(repeat)],
+    }
+
+
+def bench_battleship(repeat):
+    import game
+    game.init()
+    frames = 120
+    samples = []
+    for _ in range(repeat):
+        samples.append(timed(game.play_battleship_pygame, frames, 0) / frames)
+    return {'battleship.frame': samples}
+
+
+def bench_battleship_ai(repeat):
+    from battleship_ai import DensityAI
+    from battleship_board import Board, place_fleet
+    ai = DensityAI(random.Random(0))
+    # Whole games on the classic 10x10 board: time per move and shots to win
+    move_10, shots_10 = [], []
+    for game in range(repeat * 5):
+        board = Board(10)
+        place_fleet(board, [5, 4, 3, 3, 2], seed=game)
+        shots = 0
+        start = time.perf_counter()
+        while not board.all_sunk:
+            board.fire(*ai.next_shot(board))
+            shots += 1
+        move_10.append((time.perf_counter() - start) * 1000 / shots)
+        shots_10.append(shots)
+    # 100 moves on a 64x64 board with 200 ships
+    move_64 = []
+    for game in range(repeat):
+        board = Board(64)
+        place_fleet(board, [5, 4, 4, 3, 3, 3, 2, 2, 2, 2] * 20, seed=game)
+        move_64.append(timed(lambda: [board.fire(*ai.next_shot(board)) for _ in range(100)]) / 100)
+    return {
+        'battleship_ai.move.10x10': move_10,
+        'battleship_ai.move.64x64': move_64,
+        'battleship_ai.shots_to_win.10x10': {'unit': 'shots', 'samples': shots_10},
+    }
+
+
+GROUPS = {
+    'startup': bench_startup,
+    'draw_items': bench_draw_items,
+    'animations': bench_animations,
+    'battleship': bench_battleship,
+    'battleship_ai': bench_battleship_ai,
+}
+
+
+def run_group(name, repeat):
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '_child', name, '--repeat', str(repeat)],
+                            cwd=ROOT, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def command_run(args):
+    groups = args.only or list(GROUPS)
+    results = {}
+    for name in groups:
+        print(f"Running {name}...", file=sys.stderr)
+        for metric, samples in run_group(name, args.repeat).items():
+            if isinstance(samples, dict):
+                results[metric] = summarize(samples['samples'], samples['unit'])
+            else:
+                results[metric] = summarize(samples)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': importlib.metadata.version('pygame'),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as file:
+            file.write(text)
+    print_table(results)
+    return 0
+
+
+def command_child(args):
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    print(json.dumps(GROUPS[args.group](args.repeat)))
+    return 0
+
+
+def command_compare(args):
+    with open(args.baseline) as file:
+        baseline = json.load(file)['results']
+    with open(args.current) as file:
+        current = json.load(file)['results']
+    regressions = 0
+    print(f"{'metric':45} {'baseline':>10} {'current':>10} {'change':>8}")
+    for metric in sorted(set(baseline) | set(current)):
+        if metric not in baseline or metric not in current:
+            print(f"{metric:45} {'(only in ' + ('current' if metric in current else 'baseline') + ')':>30}")
+            continue
+        old, new = baseline[metric]['median'], current[metric]['median']
+        change = (new - old) / old if old else 0.0
+        flag = ''
+        if change > args.threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print(f"{metric:45} {old:10.3f} {new:10.3f} {change:+8.1%}{flag}")
+    if regressions:
+        print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def print_table(results):
+    print(f"{'metric':45} {'median':>10} {'p95':>10}  unit")
+    for metric, summary in results.items():
+        print(f"{metric:45} {summary['median']:10.3f} {summary['p95']:10.3f}  {summary['unit']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless benchmarks for zaid.py and game.py')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run the benchmarks')
+    run.add_argument('--out', help='write results JSON here')
+    run.add_argument('--repeat', type=int, default=10, help='samples per metric (draw_items takes 10x this)')
+    run.add_argument('--only', nargs='+', choices=list(GROUPS), help='run only these groups')
+    run.set_defaults(handler=command_run)
+
+    compare = commands.add_parser('compare', help='compare results against a saved baseline')
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown of the median (default 0.10)')
+    compare.set_defaults(handler=command_compare)
+
+    child = commands.add_parser('_child')
+    child.add_argument('group', choices=list(GROUPS))
+    child.add_argument('--repeat', type=int, default=10)
+    child.set_defaults(handler=command_child)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
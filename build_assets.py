@@ -0,0 +1,189 @@
+# Offline asset build for zaid.py.
+#
+# Reads the asset list from zaid.register_assets(), pre-scales every image to
+# the size the game draws it at, transcodes WAV to OGG (needs ffmpeg on PATH;
+# otherwise the WAV is copied as-is), skips everything the game never
+# references, and writes fingerprinted files plus bundle/manifest.json. The
+# same files are also packed into bundle/assets.pak (see assetpack.py), which
+# zaid.py prefers over the manifest when it exists. Prints bundle size and
+# load time before and after.
+#
+#   python build_assets.py                   # build into bundle/
+#   python build_assets.py --stage build/stage
+#       also copy the code, content packs and asset pack into a clean folder for pygbag,
+#       so the web build ships only what the game uses:
+#       python -m pygbag --build build/stage
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+# Build headless; measure_load() starts the mixer, which needs no sound card this way
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+from assetpack import open_pack, write_pack
+from assets import AssetManager, load_manifest
+from sprite_cache import SpriteCache
+import zaid
+
+# Folders zaid.py loads assets from, plus the duplicate audio export that pygbag would otherwise ship
+SOURCE_PATHS = ['images', 'letter_images', 'number_images', 'word_images', 'who_images', 'who_sounds', 'sounds',
+                'files (online-audio-converter.com)', 'files (online-audio-converter.com).zip']
+
+
+def path_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+
+def fingerprint(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# Write `data` as <out>/<dir>/<stem>.<hash><ext> and return its manifest entry
+def write_fingerprinted(out_dir, source, data, ext, **extra):
+    digest = fingerprint(data)
+    directory, name = os.path.split(source)
+    stem = os.path.splitext(name)[0]
+    relative = os.path.join(directory, f'{stem}.{digest[:10]}{ext}').replace(os.sep, '/')
+    target = os.path.join(out_dir, relative)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as file:
+        file.write(data)
+    return {'file': relative, 'sha256': digest, 'bytes': len(data), **extra}
+
+
+def build_image(source, size, out_dir, tmp_path):
+    image = pygame.image.load(source)
+    # Only shrink: an upscaled copy (e.g. the background) is bigger and looks no
+    # better, so those are left for the game to scale at runtime
+    if size is not None and size[0] * size[1] < image.get_width() * image.get_height():
+        image = pygame.transform.scale(image, size)  # Same scaling the game uses at runtime
+    pygame.image.save(image, tmp_path)
+    with open(tmp_path, 'rb') as file:
+        data = file.read()
+    return write_fingerprinted(out_dir, source, data, '.png', size=list(image.get_size()))
+
+
+def build_sound(source, out_dir, tmp_path, use_ogg):
+    if use_ogg:
+        subprocess.run(['ffmpeg', '-loglevel', 'error', '-y', '-i', source, '-c:a', 'libvorbis', '-q:a', '4', tmp_path],
+                       check=True)
+        with open(tmp_path, 'rb') as file:
+            return write_fingerprinted(out_dir, source, file.read(), '.ogg')
+    with open(source, 'rb') as file:
+        return write_fingerprinted(out_dir, source, file.read(), os.path.splitext(source)[1])
+
+
+def build(out_dir, use_ogg):
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+    manager = AssetManager(SpriteCache(), verbose=False)
+    zaid.register_assets(manager)
+    tmp_image = os.path.join(out_dir, '.tmp.png')
+    tmp_sound = os.path.join(out_dir, '.tmp.ogg')
+    entries = {}
+    missing = []
+    for name in manager.names():
+        category = manager.category(name)
+        for source in category.image_paths.values():
+            if not os.path.exists(source):
+                missing.append(source)
+                continue
+            entries[source.replace(os.sep, '/')] = build_image(source, category.image_size, out_dir, tmp_image)
+        sound_paths = list(category.sound_paths.values()) + ([category.prompt_path] if category.prompt_path else [])
+        for source in sound_paths:
+            if not os.path.exists(source):
+                missing.append(source)
+                continue
+            entries[source.replace(os.sep, '/')] = build_sound(source, out_dir, tmp_sound, use_ogg)
+    for tmp in (tmp_image, tmp_sound):
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as file:
+        json.dump({'version': 1, 'assets': entries}, file, ensure_ascii=False, indent=1, sort_keys=True)
+    write_pack(os.path.join(out_dir, 'assets.pak'), pack_entries(out_dir, entries))
+    return entries, missing
+
+
+# Archive entries (source name, built bytes, type) for every manifest entry
+def pack_entries(out_dir, entries):
+    for source, entry in sorted(entries.items()):
+        with open(os.path.join(out_dir, entry['file']), 'rb') as file:
+            data = file.read()
+        kind = 'image' if entry['file'].endswith('.png') else 'sound'
+        yield source, data, kind
+
+
+# Time loading every category the way the game does, from sources, a manifest or a pack
+def measure_load(manifest=None, pack=None):
+    if pygame.mixer.get_init() is None:
+        pygame.mixer.init()
+    manager = AssetManager(SpriteCache(), budget_bytes=sys.maxsize, manifest=manifest, pack=pack, verbose=False)
+    zaid.register_assets(manager)
+    start = time.perf_counter()
+    for name in manager.names():
+        manager.load(name)
+    return time.perf_counter() - start
+
+
+def stage(stage_dir, out_dir):
+    if os.path.isdir(stage_dir):
+        shutil.rmtree(stage_dir)
+    os.makedirs(stage_dir)
+    for name in os.listdir('.'):
+        if name.endswith('.py') or name == 'pyproject.toml':
+            shutil.copy2(name, stage_dir)
+    shutil.copytree('packs', os.path.join(stage_dir, 'packs'))
+    os.makedirs(os.path.join(stage_dir, 'bundle'))
+    shutil.copy2(os.path.join(out_dir, 'assets.pak'), os.path.join(stage_dir, 'bundle', 'assets.pak'))
+    # pygbag's page icon (see [tool.pygbag] in pyproject.toml)
+    icon = os.path.join('images', 'abstract_pattern.png')
+    os.makedirs(os.path.join(stage_dir, 'images'), exist_ok=True)
+    shutil.copy2(icon, os.path.join(stage_dir, icon))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the pre-scaled, fingerprinted asset bundle for zaid.py')
+    parser.add_argument('--out', default='bundle', help='output folder (default: bundle)')
+    parser.add_argument('--no-ogg', action='store_true', help='copy WAV files instead of transcoding to OGG')
+    parser.add_argument('--stage', help='also copy the code and asset pack into this folder for pygbag')
+    args = parser.parse_args()
+
+    use_ogg = not args.no_ogg and shutil.which('ffmpeg') is not None
+    if not args.no_ogg and not use_ogg:
+        print('ffmpeg not found; copying WAV files without transcoding.')
+
+    before_bytes = sum(path_size(path) for path in SOURCE_PATHS if os.path.exists(path))
+    before_load = measure_load()
+    entries, missing = build(args.out, use_ogg)
+    after_bytes = sum(entry['bytes'] for entry in entries.values())
+    manifest_load = measure_load(manifest=load_manifest(os.path.join(args.out, 'manifest.json')))
+    pack_load = measure_load(pack=open_pack(os.path.join(args.out, 'assets.pak')))
+
+    print(f'Built {len(entries)} assets into {args.out}/')
+    if missing:
+        print(f'Skipped {len(missing)} missing assets: {", ".join(missing)}')
+    print(f'Size: {before_bytes / 1e6:.2f} MB -> {after_bytes / 1e6:.2f} MB')
+    print(f'Load time (all categories): {before_load * 1000:.0f} ms -> {manifest_load * 1000:.0f} ms (manifest), '
+          f'{pack_load * 1000:.0f} ms (assets.pak)')
+
+    if args.stage:
+        stage(args.stage, args.out)
+        print(f'Staged web build in {args.stage}/')
+
+
+if __name__ == '__main__':
+    main()
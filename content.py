@@ -0,0 +1,132 @@
+# Content packs: the categories and items the learning game asks about.
+#
+# packs/index.json lists the categories (menu title, prompt sound, whether the
+# menu shows it) and the packs that fill them:
+#
+#   {"version": 1,
+#    "categories": [{"id": "letters", "title": "Find the Letter", "prompt": "sounds/find_the_letter.wav"}],
+#    "packs": [{"id": "arabic-letters", "category": "letters", "file": "letters.json"}]}
+#
+# Each pack file lists its items; "sound" and "group" are optional:
+#
+#   {"id": "arabic-letters",
+#    "items": [{"id": "ا", "image": "letter_images/ا.png", "sound": "sounds/prompt_ا.wav", "group": "..."}]}
+#
+# Several packs may add to the same category. Only the index is read at
+# startup; a category's pack files are read the first time its items are
+# needed. Every item gets a position in its category, which is also the key
+# of its image and sound in the AssetManager.
+import json
+import os
+
+INDEX_VERSION = 1
+
+
+class ContentItem:
+    __slots__ = ('id', 'category', 'index', 'image', 'sound', 'group', 'pack')
+
+    def __init__(self, id, category, index, image, sound=None, group=None, pack=None):
+        self.id = id
+        self.category = category
+        self.index = index
+        self.image = image
+        self.sound = sound
+        self.group = group
+        self.pack = pack
+
+    def __repr__(self):
+        return f'ContentItem({self.category}/{self.id})'
+
+
+class Category:
+    def __init__(self, id, title, prompt=None, menu=True):
+        self.id = id
+        self.title = title
+        self.prompt = prompt
+        self.menu = menu
+        self.pack_files = []  # (pack id, path), read on first use
+        self._items = None
+        self._by_id = {}
+        self._groups = {}
+
+    @property
+    def loaded(self):
+        return self._items is not None
+
+    def items(self, group=None):
+        self._load()
+        return self._items if group is None else self._groups.get(group, [])
+
+    def item(self, item_id):
+        self._load()
+        return self._by_id.get(item_id)
+
+    def groups(self):
+        self._load()
+        return list(self._groups)
+
+    def _load(self):
+        if self._items is not None:
+            return
+        items = []
+        for pack_id, path in self.pack_files:
+            with open(path, 'r', encoding='utf-8') as file:
+                pack = json.load(file)
+            for entry in pack['items']:
+                if entry['id'] in self._by_id:
+                    continue  # The first pack to define an item wins
+                item = ContentItem(entry['id'], self.id, len(items), entry['image'], entry.get('sound'),
+                                   entry.get('group'), pack.get('id', pack_id))
+                items.append(item)
+                self._by_id[item.id] = item
+                if item.group is not None:
+                    self._groups.setdefault(item.group, []).append(item)
+        self._items = items
+
+
+class ContentRegistry:
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self._categories = {}
+        with open(index_path, 'r', encoding='utf-8') as file:
+            index = json.load(file)
+        if index.get('version') != INDEX_VERSION:
+            raise ValueError(f"{index_path} has unsupported version {index.get('version')}")
+        for entry in index['categories']:
+            self._categories[entry['id']] = Category(entry['id'], entry.get('title', entry['id']),
+                                                     entry.get('prompt'), entry.get('menu', True))
+        base = os.path.dirname(index_path)
+        for entry in index['packs']:
+            category = self._categories.get(entry['category'])
+            if category is None:
+                raise ValueError(f"Pack '{entry['id']}' refers to unknown category '{entry['category']}'")
+            category.pack_files.append((entry['id'], os.path.join(base, entry['file'])))
+
+    def __contains__(self, category_id):
+        return category_id in self._categories
+
+    def categories(self):
+        return list(self._categories.values())
+
+    def menu_categories(self):
+        return [category for category in self._categories.values() if category.menu]
+
+    def category(self, category_id):
+        return self._categories[category_id]
+
+    def items(self, category_id, group=None):
+        return self._categories[category_id].items(group)
+
+    def item(self, category_id, item_id):
+        return self._categories[category_id].item(item_id)
+
+    # Declare each category's images and sounds to an AssetManager, keyed by
+    # item index. Pack files are only read when the manager first needs them.
+    def register_assets(self, manager, image_size):
+        for category in self._categories.values():
+            manager.register_lazy(category.id, lambda category=category: {
+                'images': {item.index: item.image for item in category.items()},
+                'sounds': {item.index: item.sound for item in category.items() if item.sound},
+                'prompt': category.prompt,
+                'image_size': image_size,
+            })
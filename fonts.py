@@ -0,0 +1,68 @@
+from collections import OrderedDict
+
+import pygame
+
+
+# Fonts keyed by (face, size). match_font() goes through fontconfig and is
+# slow, so each face is resolved to a file once; face None is pygame's
+# default font.
+_font_paths = {}
+_fonts = {}
+
+
+def get_font(face, size):
+    key = (face, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        if face is not None and face not in _font_paths:
+            _font_paths[face] = pygame.font.match_font(face)
+        font = pygame.font.Font(_font_paths.get(face), size)
+        _fonts[key] = font
+    return font
+
+
+# LRU cache of rendered text surfaces keyed by (text, font, color, antialias)
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, font, color, antialias=True):
+        key = (text, font, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+text_cache = TextCache()
+
+
+def render_text(text, font, color, antialias=True):
+    return text_cache.render(text, font, color, antialias)
@@ -1,152 +1,150 @@
-import random
 import tkinter as tk
-from tkinter import messagebox
 from tkinter import ttk
 import time
-import threading
 import pygame
 import os
-import json
-
-# Initialize Pygame mixer for sound effects and animations
-try:
-    pygame.mixer.init()
-    # Load sound effects with error handling
-    hit_sound = pygame.mixer.Sound("hit.wav") if os.path.exists("hit.wav") else None
-    miss_sound = pygame.mixer.Sound("miss.wav") if os.path.exists("miss.wav") else None
-    sink_sound = pygame.mixer.Sound("sink.wav") if os.path.exists("sink.wav") else None
-except pygame.error:
-    hit_sound = None
-    miss_sound = None
-    sink_sound = None
-
-def play_sound(sound):
-    if sound:
-        threading.Thread(target=sound.play).start()
-
-def create_board(size):
-    return [["O" for _ in range(size)] for _ in range(size)]
-
-def place_ships(board, ships):
-    ship_positions = []
-    directions = [(0, 1), (1, 0)]  # horizontal or vertical
-    for _ in range(ships):
-        while True:
-            row = random.randint(0, len(board) - 1)
-            col = random.randint(0, len(board) - 1)
-            direction = random.choice(directions)
-            if can_place_ship(board, row, col, direction):
-                for i in range(3):  # example length of ship
-                    r, c = row + i * direction[0], col + i * direction[1]
-                    board[r][c] = "S"
-                    ship_positions.append((r, c))
-                break
-    return ship_positions
-
-def can_place_ship(board, row, col, direction, length=3):
-    for i in range(length):
-        r, c = row + i * direction[0], col + i * direction[1]
-        if r >= len(board) or c >= len(board) or board[r][c] != "O":
-            return False
-    return True
-
-def save_high_score(score):
+import sqlite3
+
+from audio import BATTLESHIP_VOICES, EffectPool
+from battleship_ai import DensityAI
+from battleship_board import HIT, REPEAT, SUNK
+from battleship_core import BattleshipGame
+from score_store import default_store
+from tk_ui import Toast, TkScheduler
+
+# Sound effects, loaded by init()
+hit_sound = None
+miss_sound = None
+sink_sound = None
+
+# Function to start the Pygame mixer and load the sound effects; importing
+# this module does neither
+def init():
+    global hit_sound, miss_sound, sink_sound
     try:
-        with open("high_scores.json", "r") as file:
-            scores = json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        scores = []
-
-    scores.append(score)
-    scores = sorted(scores)[:5]  # Keep only top 5 scores
-
-    with open("high_scores.json", "w") as file:
-        json.dump(scores, file)
-
-def display_high_scores():
+        pygame.mixer.init()
+        # Load sound effects with error handling
+        hit_sound = pygame.mixer.Sound("hit.wav") if os.path.exists("hit.wav") else None
+        miss_sound = pygame.mixer.Sound("miss.wav") if os.path.exists("miss.wav") else None
+        sink_sound = pygame.mixer.Sound("sink.wav") if os.path.exists("sink.wav") else None
+    except pygame.error:
+        hit_sound = None
+        miss_sound = None
+        sink_sound = None
+
+# Effects play on reserved mixer channels with per-category voice limits (see audio.EffectPool)
+effects = EffectPool(BATTLESHIP_VOICES)
+
+def play_sound(sound, category):
+    effects.play(sound, category)
+
+# Scores live in an SQLite store (score_store.py); the write happens on a background thread
+def save_high_score(score, shots=None, board_size=None):
+    default_store().record_score(score, shots, board_size)
+
+# Top scores as text for the in-window toast
+def high_scores_text():
     try:
-        with open("high_scores.json", "r") as file:
-            scores = json.load(file)
+        scores = default_store().top_scores(5)
+    except sqlite3.Error as error:
+        return f"Could not read the high scores: {error}", 'bad'
+    if scores:
         score_text = "\n".join([f"{i+1}. {s} seconds" for i, s in enumerate(scores)])
-        messagebox.showinfo("High Scores", f"Top Scores:\n{score_text}")
-    except (FileNotFoundError, json.JSONDecodeError):
-        messagebox.showinfo("High Scores", "No high scores yet. Be the first!")
+        return f"Top Scores:\n{score_text}", 'info'
+    return "No high scores yet. Be the first!", 'info'
 
+# Everything runs on the Tk main thread: animations and messages are
+# root.after() callbacks (see tk_ui.py), and Restart resets the existing
+# widgets instead of rebuilding the window
 def play_battleship_gui():
-    board_size = 5
-    num_ships = 3
-    board = create_board(board_size)
-    ship_positions = place_ships(board, num_ships)
-    turns = 7
+    game = BattleshipGame()  # 5x5 board, three ships of length 3, 7 misses allowed
+    board = game.board
+    board_size = game.size
     start_time = time.time()
+    hint_ai = DensityAI()
+    flash_colors = {"hit": ["#FF6B6B", "#FFFF00"], "miss": ["#00796B", "#00BFFF"]}
 
     def update_timer():
         elapsed_time = int(time.time() - start_time)
         timer_label.config(text=f"⏱ Time: {elapsed_time} seconds")
-        root.after(1000, update_timer)
+        scheduler.later(1000, update_timer, 'timer')
 
     def animate_hit_miss(button, animation_type):
-        colors = {"hit": ["#FF6B6B", "#FFFF00"], "miss": ["#00796B", "#00BFFF"]}
-        if animation_type in colors:
-            for color in colors[animation_type]:
-                button.config(bg=color)
-                button.update()
-                time.sleep(0.1)
-            button.config(bg=colors[animation_type][0])
+        colors = flash_colors[animation_type]
+        scheduler.flash(button, colors, colors[0])
+
+    def end_game():
+        scheduler.cancel('timer')
+        for row in button_grid:
+            for btn in row:
+                btn.config(state=tk.DISABLED)
 
     def make_guess(row, col):
-        nonlocal turns
-        if turns <= 0:
-            messagebox.showinfo("Game Over", "No more turns left. Please restart the game.")
+        if game.over:
+            toast.show("The game is over. Press Restart to play again.")
             return
-        if board[row][col] == "X":
-            messagebox.showinfo("Battleship", "You already guessed that one.")
-        elif board[row][col] == "S":
-            board[row][col] = "X"
+        result = game.fire(row, col)
+        if result == REPEAT:
+            toast.show("You already guessed that one.")
+        elif result in (HIT, SUNK):
             button_grid[row][col].config(text="💥", state=tk.DISABLED, foreground="#FFFFFF")
-            threading.Thread(target=animate_hit_miss, args=(button_grid[row][col], "hit")).start()
-            play_sound(hit_sound)
-            ship_positions.remove((row, col))
-            if not ship_positions:
-                play_sound(sink_sound)
-                threading.Thread(target=animate_hit_miss, args=(button_grid[row][col], "hit")).start()
+            animate_hit_miss(button_grid[row][col], "hit")
+            play_sound(hit_sound, 'hit')
+            if game.won:
+                play_sound(sink_sound, 'sink')
                 elapsed_time = int(time.time() - start_time)
-                messagebox.showinfo("Battleship", f"Congratulations! You sunk all the battleships in {elapsed_time} seconds!")
-                save_high_score(elapsed_time)
-                root.destroy()
+                save_high_score(elapsed_time, game.shots, game.size)
+                end_game()
+                toast.show(f"Congratulations! You sunk all the battleships in {elapsed_time} seconds!", 'good', duration=None)
+            elif result == SUNK:
+                toast.show("You sunk a ship!", 'good')
             else:
-                messagebox.showinfo("Battleship", "You hit a ship!")
+                toast.show("You hit a ship!", 'good')
         else:
-            board[row][col] = "X"
             button_grid[row][col].config(text="X", state=tk.DISABLED, foreground="#FFFFFF")
-            threading.Thread(target=animate_hit_miss, args=(button_grid[row][col], "miss")).start()
-            play_sound(miss_sound)
-            turns -= 1
-            if turns == 0:
-                remaining_ships = [f"Row: {r}, Col: {c}" for r, c in ship_positions]
+            animate_hit_miss(button_grid[row][col], "miss")
+            play_sound(miss_sound, 'miss')
+            if game.over:
+                remaining_ships = [f"Row: {r}, Col: {c}" for r, c in game.remaining_cells()]
                 elapsed_time = int(time.time() - start_time)
-                messagebox.showinfo("Game Over", f"Game Over. The remaining ships were at: {', '.join(remaining_ships)}. Time taken: {elapsed_time} seconds.")
-                game_over_label = tk.Label(root, text="Game Over", font=("Helvetica", 24, "bold"), bg="#1E1E1E", fg="#FF6B6B")
-                game_over_label.pack(pady=20)
+                end_game()
+                game_over_label.pack(pady=20, before=footer_label)
+                toast.show(f"The remaining ships were at: {', '.join(remaining_ships)}.\nTime taken: {elapsed_time} seconds.", 'bad', duration=None)
             else:
-                messagebox.showinfo("Battleship", f"You missed! Turns left: {turns}")
+                toast.show(f"You missed! Turns left: {game.turns_left}")
 
     def give_hint():
-        if ship_positions:
-            hint_row, hint_col = random.choice(ship_positions)
-            messagebox.showinfo("Hint", f"A battleship is somewhere around Row: {hint_row}, Column: {hint_col}")
+        if not game.over:
+            # The cell the probability-density AI would fire at next
+            hint_row, hint_col = hint_ai.next_shot(board)
+            button_grid[hint_row][hint_col].config(bg="#FFD700")
+            toast.show(f"Your best shot is Row: {hint_row}, Column: {hint_col}", 'good')
         else:
-            messagebox.showinfo("Hint", "No ships left to hint!")
+            toast.show("No ships left to hint!")
+
+    def show_high_scores():
+        text, kind = high_scores_text()
+        toast.show(text, kind, duration=5000)
 
     def restart_game():
-        root.destroy()
-        play_battleship_gui()
+        nonlocal game, board, start_time
+        scheduler.cancel()
+        game = BattleshipGame()
+        board = game.board
+        start_time = time.time()
+        for row in button_grid:
+            for btn in row:
+                btn.config(text="\U0001F3F3", state=tk.NORMAL, bg="#00796B", fg="#E1F5FE")
+        game_over_label.pack_forget()
+        toast.clear()
+        update_timer()
 
     root = tk.Tk()
     root.title("Battleship Game")
     root.configure(bg="#1E1E1E")
     root.geometry("700x800")
     root.resizable(False, False)
+    scheduler = TkScheduler(root)
 
     style = ttk.Style()
     style.theme_use("clam")
@@ -179,40 +177,64 @@ def play_battleship_gui():
     restart_button = tk.Button(button_frame, text="\U0001F504 Restart", command=restart_game, font=("Helvetica", 16, "bold"), width=14, bg="#FF6347", fg="#FFFFFF", relief=tk.RAISED, bd=6)
     restart_button.grid(row=0, column=1, padx=10, pady=10)
 
-    high_score_button = tk.Button(button_frame, text="\U0001F4C8 High Scores", command=display_high_scores, font=("Helvetica", 16, "bold"), width=14, bg="#4ECDC4", fg="#1E1E1E", relief=tk.RAISED, bd=6)
+    high_score_button = tk.Button(button_frame, text="\U0001F4C8 High Scores", command=show_high_scores, font=("Helvetica", 16, "bold"), width=14, bg="#4ECDC4", fg="#1E1E1E", relief=tk.RAISED, bd=6)
     high_score_button.grid(row=1, column=0, columnspan=2, padx=10, pady=10)
 
+    # Shown when the turns run out, hidden again on restart
+    game_over_label = tk.Label(root, text="Game Over", font=("Helvetica", 24, "bold"), bg="#1E1E1E", fg="#FF6B6B")
+
     footer_label = tk.Label(root, text="\U0001F340 Good Luck, Captain! \U0001F340", font=("Helvetica", 20, "italic"), bg="#1E1E1E", fg="#FFFFFF")
     footer_label.pack(pady=20)
 
+    toast = Toast(root, scheduler)
+
     update_timer()
     root.mainloop()
 
 if __name__ == "__main__":
+    init()
     play_battleship_gui()
 
 
 
 
-    import random
 import time
-import threading
 import pygame
 import os
-import json
-
-# Initialize Pygame mixer for sound effects and Pygame for graphics
-pygame.init()
-try:
-    pygame.mixer.init()
-    # Load sound effects with error handling
-    hit_sound = pygame.mixer.Sound("hit.wav") if os.path.exists("hit.wav") else None
-    miss_sound = pygame.mixer.Sound("miss.wav") if os.path.exists("miss.wav") else None
-    sink_sound = pygame.mixer.Sound("sink.wav") if os.path.exists("sink.wav") else None
-except pygame.error:
-    hit_sound = None
-    miss_sound = None
-    sink_sound = None
+import sqlite3
+
+from audio import BATTLESHIP_VOICES, EffectPool
+from battleship_ai import DensityAI
+from battleship_board import REPEAT
+from battleship_core import BattleshipGame
+from battleship_view import BoardView, Button, hint_outline
+from fonts import get_font, render_text
+from pacer import FramePacer
+from profiler import create_profiler
+from replay import LiveSource
+from scene import Scene
+from score_store import default_store
+
+# Sound effects, loaded by init()
+hit_sound = None
+miss_sound = None
+sink_sound = None
+
+# Function to start Pygame (graphics and mixer) and load the sound effects;
+# importing this module does neither
+def init():
+    global hit_sound, miss_sound, sink_sound
+    pygame.init()
+    try:
+        pygame.mixer.init()
+        # Load sound effects with error handling
+        hit_sound = pygame.mixer.Sound("hit.wav") if os.path.exists("hit.wav") else None
+        miss_sound = pygame.mixer.Sound("miss.wav") if os.path.exists("miss.wav") else None
+        sink_sound = pygame.mixer.Sound("sink.wav") if os.path.exists("sink.wav") else None
+    except pygame.error:
+        hit_sound = None
+        miss_sound = None
+        sink_sound = None
 
 # Colors
 WHITE = (255, 255, 255)
@@ -232,172 +254,178 @@ SCREEN_HEIGHT = 700
 CELL_SIZE = 60
 MARGIN = 10
 
-def play_sound(sound):
-    if sound:
-        threading.Thread(target=sound.play).start()
-
-def create_board(size):
-    return [["O" for _ in range(size)] for _ in range(size)]
-
-def place_ships(board, ships):
-    ship_positions = []
-    directions = [(0, 1), (1, 0)]  # horizontal or vertical
-    for _ in range(ships):
-        while True:
-            row = random.randint(0, len(board) - 1)
-            col = random.randint(0, len(board) - 1)
-            direction = random.choice(directions)
-            if can_place_ship(board, row, col, direction):
-                for i in range(3):  # example length of ship
-                    r, c = row + i * direction[0], col + i * direction[1]
-                    board[r][c] = "S"
-                    ship_positions.append((r, c))
-                break
-    return ship_positions
-
-def can_place_ship(board, row, col, direction, length=3):
-    for i in range(length):
-        r, c = row + i * direction[0], col + i * direction[1]
-        if r >= len(board) or c >= len(board) or board[r][c] != "O":
-            return False
-    return True
-
-def save_high_score(score):
-    try:
-        with open("high_scores.json", "r") as file:
-            scores = json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        scores = []
+# Effects play on reserved mixer channels with per-category voice limits (see audio.EffectPool)
+effects = EffectPool(BATTLESHIP_VOICES)
 
-    scores.append(score)
-    scores = sorted(scores)[:5]  # Keep only top 5 scores
+def play_sound(sound, category):
+    effects.play(sound, category)
 
-    with open("high_scores.json", "w") as file:
-        json.dump(scores, file)
+# Scores live in an SQLite store (score_store.py); the write happens on a background thread
+def save_high_score(score, shots=None, board_size=None):
+    default_store().record_score(score, shots, board_size)
 
 def display_high_scores(screen):
     try:
-        with open("high_scores.json", "r") as file:
-            scores = json.load(file)
-        score_text = [f"{i+1}. {s} seconds" for i, s in enumerate(scores)]
-    except (FileNotFoundError, json.JSONDecodeError):
-        score_text = ["No high scores yet. Be the first!"]
+        scores = default_store().top_scores(5)
+        score_text = [f"{i+1}. {s} seconds" for i, s in enumerate(scores)] or ["No high scores yet. Be the first!"]
+    except sqlite3.Error as error:
+        score_text = [f"Could not read the high scores: {error}"]
 
-    font = pygame.font.Font(None, 36)
+    font = get_font(None, 36)
     screen.fill(BLACK)
     y_offset = 100
     for line in score_text:
-        text = font.render(line, True, WHITE)
+        text = render_text(line, font, WHITE)
         screen.blit(text, (50, y_offset))
         y_offset += 40
     pygame.display.flip()
     time.sleep(3)
 
-def draw_button(screen, text, rect, color, hover_color, action=None):
-    mouse = pygame.mouse.get_pos()
-    click = pygame.mouse.get_pressed()
-    current_color = color
-
-    if rect.collidepoint(mouse):
-        current_color = hover_color
-        if click[0] == 1 and action is not None:
-            action()
-
-    pygame.draw.rect(screen, current_color, rect)
-    font = pygame.font.Font(None, 40)
-    text_surf = font.render(text, True, BLACK)
-    text_rect = text_surf.get_rect(center=rect.center)
-    screen.blit(text_surf, text_rect)
-
-def play_battleship_pygame():
-    board_size = 5
-    num_ships = 3
-    board = create_board(board_size)
-    ship_positions = place_ships(board, num_ships)
-    turns = 7
+# Where input comes from; replay.py swaps in a recorder or a replayer
+event_source = LiveSource()
+
+# max_frames stops the loop after that many frames and fps=0 runs it
+# uncapped; both are for headless benchmarking
+def play_battleship_pygame(max_frames=None, fps=60):
+    game = BattleshipGame()  # 5x5 board, three ships of length 3, 7 misses allowed
+    board = game.board
     start_time = time.time()
 
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Battleship Game")
-    clock = pygame.time.Clock()
-
-    hint_button_rect = pygame.Rect(100, 600, 150, 50)
-    restart_button_rect = pygame.Rect(300, 600, 150, 50)
-    high_scores_button_rect = pygame.Rect(500, 600, 200, 50)
+    # Nothing animates, so between events the loop only wakes for the next timer second (see pacer.py)
+    pacer = FramePacer(event_source, fps)
+    # Only what changed is repainted: the board view redraws changed cells,
+    # the texts re-render when their value changes and the buttons when their
+    # hover state does
+    scene = Scene(screen, fill_color=DARK_BLUE)
+    board_view = BoardView(board, (150, 150), CELL_SIZE, MARGIN, DARK_BLUE)
+    scene.set('board', board_view.surface, board_view.origin)
+    hint_image = hint_outline(CELL_SIZE)
+
+    # Hints come from the probability-density AI; the suggested cell stays
+    # outlined until the next shot
+    hint_ai = DensityAI()
+    hint_cell = None
+
+    def show_hint():
+        nonlocal hint_cell
+        if hint_cell is None and not game.over:
+            hint_cell = hint_ai.next_shot(board)
 
     def restart_game():
-        nonlocal board, ship_positions, turns, start_time
-        board = create_board(board_size)
-        ship_positions = place_ships(board, num_ships)
-        turns = 7
+        nonlocal game, board, start_time, hint_cell
+        game = BattleshipGame()
+        board = game.board
         start_time = time.time()
-
+        hint_cell = None
+        board_view.set_board(board)
+        scene.set('board', board_view.surface, board_view.origin)
+        scene.mark_dirty(board_view.rect)
+
+    def show_high_scores():
+        display_high_scores(screen)
+        scene.invalidate()  # The score list was drawn over the whole window
+
+    buttons = {
+        'hint_button': Button("Hint", (100, 600, 150, 50), BUTTON_COLOR, BUTTON_HOVER_COLOR, show_hint),
+        'restart_button': Button("Restart", (300, 600, 150, 50), BUTTON_COLOR, BUTTON_HOVER_COLOR, restart_game),
+        'high_scores_button': Button("High Scores", (500, 600, 200, 50), BUTTON_COLOR, BUTTON_HOVER_COLOR, show_high_scores),
+    }
+
+    font = get_font(None, 50)
+    # Frame-time profiler; a no-op unless ZAID_PROFILE is set (F3 toggles its overlay)
+    profiler = create_profiler('battleship')
+
+    shown_time = None
+    shown_turns = None
+    frame = 0
     running = True
     while running:
-        screen.fill(DARK_BLUE)
-        elapsed_time = int(time.time() - start_time)
-        font = pygame.font.Font(None, 50)
-        timer_text = font.render(f"⏱ Time: {elapsed_time} seconds", True, WHITE)
-        screen.blit(timer_text, (10, 10))
-        turns_text = font.render(f"Turns Left: {turns}", True, WHITE)
-        screen.blit(turns_text, (SCREEN_WIDTH - 250, 10))
-
-        # Draw the board
-        for row in range(board_size):
-            for col in range(board_size):
-                color = LIGHT_BLUE if board[row][col] == "O" else RED if board[row][col] == "X" else GREEN
-                pygame.draw.rect(screen,
-                                 color,
-                                 [(MARGIN + CELL_SIZE) * col + MARGIN + 150,
-                                  (MARGIN + CELL_SIZE) * row + MARGIN + 150,
-                                  CELL_SIZE,
-                                  CELL_SIZE],
-                                 border_radius=5)
-                if board[row][col] == "X":
-                    explosion_center = [(MARGIN + CELL_SIZE) * col + MARGIN + 150 + CELL_SIZE // 2,
-                                        (MARGIN + CELL_SIZE) * row + MARGIN + 150 + CELL_SIZE // 2]
-                    pygame.draw.circle(screen, YELLOW, explosion_center, 10)
-
-        # Draw buttons
-        draw_button(screen, "Hint", hint_button_rect, BUTTON_COLOR, BUTTON_HOVER_COLOR, lambda: print("Hint button clicked"))
-        draw_button(screen, "Restart", restart_button_rect, BUTTON_COLOR, BUTTON_HOVER_COLOR, restart_game)
-        draw_button(screen, "High Scores", high_scores_button_rect, BUTTON_COLOR, BUTTON_HOVER_COLOR, lambda: display_high_scores(screen))
-
-        for event in pygame.event.get():
+        profiler.begin_frame()
+        events = event_source.get(pacer.wait_ms)
+        profiler.mark('idle')
+        for event in events:
+            if profiler.handle_event(event):
+                continue
+            if any(button.handle_event(event) for button in buttons.values()):
+                continue
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                scene.invalidate()
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                pos = pygame.mouse.get_pos()
-                col = (pos[0] - 150) // (CELL_SIZE + MARGIN)
-                row = (pos[1] - 150) // (CELL_SIZE + MARGIN)
-
-                if 0 <= row < board_size and 0 <= col < board_size:
-                    if board[row][col] == "X":
+                cell = board_view.cell_at(event.pos)
+                if cell is not None and not game.over:
+                    row, col = cell
+                    result = game.fire(row, col)
+                    if result != REPEAT:
+                        hint_cell = None
+                    if result == REPEAT:
                         print("Already guessed that one.")
-                    elif board[row][col] == "S":
-                        board[row][col] = "X"
-                        play_sound(hit_sound)
-                        ship_positions.remove((row, col))
-                        if not ship_positions:
-                            play_sound(sink_sound)
+                    elif board.is_hit(row, col):
+                        play_sound(hit_sound, 'hit')
+                        if game.won:
+                            play_sound(sink_sound, 'sink')
                             elapsed_time = int(time.time() - start_time)
-                            save_high_score(elapsed_time)
+                            save_high_score(elapsed_time, game.shots, game.size)
                             print(f"Congratulations! You sunk all the battleships in {elapsed_time} seconds!")
                             running = False
                     else:
-                        board[row][col] = "X"
-                        play_sound(miss_sound)
-                        turns -= 1
-                        if turns == 0:
-                            remaining_ships = [f"Row: {r}, Col: {c}" for r, c in ship_positions]
+                        play_sound(miss_sound, 'miss')
+                        if game.over:
+                            remaining_ships = [f"Row: {r}, Col: {c}" for r, c in game.remaining_cells()]
                             elapsed_time = int(time.time() - start_time)
                             print(f"Game Over. The remaining ships were at: {', '.join(remaining_ships)}. Time taken: {elapsed_time} seconds.")
                             running = False
 
-        pygame.display.flip()
-        clock.tick(60)
+        profiler.mark('events')
 
+        # The timer text changes once per second, the turns text once per miss
+        elapsed_time = int(time.time() - start_time)
+        if elapsed_time != shown_time:
+            shown_time = elapsed_time
+            scene.set('timer', render_text(f"⏱ Time: {elapsed_time} seconds", font, WHITE), (10, 10))
+        if game.turns_left != shown_turns:
+            shown_turns = game.turns_left
+            scene.set('turns', render_text(f"Turns Left: {game.turns_left}", font, WHITE), (SCREEN_WIDTH - 250, 10))
+        for rect in board_view.sync():
+            scene.mark_dirty(rect)
+        if hint_cell is not None:
+            scene.set('hint', hint_image, board_view.cell_rect(*hint_cell).move(-4, -4).topleft, layer=1)
+        elif 'hint' in scene:
+            scene.remove('hint')
+        for name, button in buttons.items():
+            scene.set(name, button.image, button.rect.topleft)
+        overlay = profiler.overlay_surface()
+        if overlay is not None:
+            scene.set('profiler', overlay, (10, 60), layer=10)
+        elif 'profiler' in scene:
+            scene.remove('profiler')
+        rects = scene.render(update=False)
+        profiler.mark('render')
+        if rects:
+            pygame.display.update(rects)
+        profiler.mark('display')
+        event_source.end_frame((board.ships, board.shots, game.turns_left, game.status, hint_cell))
+        wake_in = 1000 - int((time.time() - start_time) * 1000) % 1000
+        if profiler.overlay_visible:
+            wake_in = min(wake_in, 500)
+        pacer.end_frame(False, wake_in)
+        profiler.mark('idle')
+        frame += 1
+        if max_frames is not None and frame >= max_frames:
+            running = False
+
+    if profiler.enabled:
+        print(f"Frame pacing: {pacer.report()}")  # Session CPU time and average fps
+    profiler.close()
     pygame.quit()
 
+# Entry point: init() once, then run the game loop
+def run(max_frames=None, fps=60):
+    play_battleship_pygame(max_frames, fps)
+
 if __name__ == "__main__":
-    play_battleship_pygame()
\ No newline at end of file
+    init()
+    run()
\ No newline at end of file
@@ -0,0 +1,117 @@
+import pygame
+
+
+# Fixed-pitch grid of equally sized cells inside a viewport.
+# Cell positions are pure arithmetic on the index, so the layout costs the
+# same for ten items as for ten thousand: nothing is stored per item, the
+# visible rows come from the scroll offset, and hit-testing divides the
+# point by the pitch instead of scanning every rectangle.
+#
+# Rects from rect() are in content coordinates (scroll offset 0); to_screen()
+# and hit_test() take the current offset into account.
+class GridLayout:
+    # `first_center` is the center of cell 0 relative to the viewport's top-left;
+    # the same margin is kept on the right and at the bottom
+    def __init__(self, count, cell_size, pitch, viewport, first_center):
+        self.count = count
+        self.cell_width, self.cell_height = cell_size
+        self.pitch_x, self.pitch_y = pitch
+        self.viewport = pygame.Rect(viewport)
+        self.left = first_center[0] - self.cell_width // 2
+        self.top = first_center[1] - self.cell_height // 2
+        usable = self.viewport.width - 2 * first_center[0]
+        self.columns = max(1, usable // self.pitch_x + 1)
+        self.rows = (count + self.columns - 1) // self.columns
+        content_height = self.top * 2 + max(0, self.rows - 1) * self.pitch_y + self.cell_height
+        self.max_scroll = max(0, content_height - self.viewport.height)
+
+    def rect(self, index):
+        row, col = divmod(index, self.columns)
+        return pygame.Rect(self.viewport.x + self.left + col * self.pitch_x,
+                           self.viewport.y + self.top + row * self.pitch_y,
+                           self.cell_width, self.cell_height)
+
+    def to_screen(self, rect, scroll):
+        return rect.move(0, -scroll)
+
+    # Indices of the cells at least partly inside the viewport
+    def visible_range(self, scroll):
+        if not self.count:
+            return range(0)
+        first_row = max(0, (scroll - self.top - self.cell_height) // self.pitch_y + 1)
+        last_row = min(self.rows - 1, (scroll + self.viewport.height - 1 - self.top) // self.pitch_y)
+        if last_row < first_row:
+            return range(0)
+        return range(first_row * self.columns, min(self.count, (last_row + 1) * self.columns))
+
+    # Index of the cell under a screen position, or None for the gaps and outside the viewport
+    def hit_test(self, pos, scroll):
+        if not self.viewport.collidepoint(pos):
+            return None
+        x = pos[0] - self.viewport.x - self.left
+        y = pos[1] - self.viewport.y + scroll - self.top
+        if x < 0 or y < 0:
+            return None
+        col, cell_x = divmod(x, self.pitch_x)
+        row, cell_y = divmod(y, self.pitch_y)
+        if col >= self.columns or cell_x >= self.cell_width or cell_y >= self.cell_height:
+            return None
+        index = row * self.columns + col
+        return index if index < self.count else None
+
+    # Smallest scroll change that brings a cell fully into view
+    def scroll_into_view(self, index, scroll, margin=10):
+        rect = self.rect(index).move(0, -self.viewport.y)
+        if rect.top - margin < scroll:
+            scroll = rect.top - margin
+        elif rect.bottom + margin > scroll + self.viewport.height:
+            scroll = rect.bottom + margin - self.viewport.height
+        return self.clamp(scroll)
+
+    def clamp(self, scroll):
+        return max(0, min(self.max_scroll, scroll))
+
+
+# Smoothly eased vertical scroll offset. scroll_by()/scroll_to() set a target
+# and update() moves towards it, halving the remaining distance every
+# `half_life_ms`.
+class ScrollView:
+    def __init__(self, half_life_ms=40):
+        self.half_life_ms = half_life_ms
+        self.layout = None
+        self.position = 0.0
+        self.target = 0
+        self._last_ms = None
+
+    @property
+    def offset(self):
+        return int(round(self.position))
+
+    @property
+    def moving(self):
+        return self.offset != self.target
+
+    def reset(self, layout):
+        self.layout = layout
+        self.position = 0.0
+        self.target = 0
+        self._last_ms = None
+
+    def scroll_by(self, dy):
+        self.scroll_to(self.target + dy)
+
+    def scroll_to(self, y):
+        self.target = self.layout.clamp(int(y)) if self.layout is not None else 0
+
+    # Advance towards the target; returns True if the offset changed
+    def update(self, now_ms):
+        last, self._last_ms = self._last_ms, now_ms
+        if not self.moving:
+            self.position = float(self.target)
+            return False
+        before = self.offset
+        elapsed = 0 if last is None else now_ms - last
+        self.position += (self.target - self.position) * (1 - 0.5 ** (elapsed / self.half_life_ms))
+        if abs(self.target - self.position) < 0.5:
+            self.position = float(self.target)
+        return self.offset != before
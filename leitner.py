@@ -0,0 +1,125 @@
+# Spaced-repetition scheduling of the items in one zaid category.
+#
+# Every item the learner has seen sits in a Leitner box. A round answered
+# right first time moves the item up a box, any wrong answer sends it back to
+# box 0, and the item comes back after INTERVALS[box] rounds. Time is counted
+# in rounds (the category's `clock`), not seconds, so a break between
+# sessions does not make every item due at once.
+#
+# Seen items wait in a heap keyed by (due round, fewer lapses last, random
+# tie-break), so picking the next item and requeueing one are O(log n).
+# Items never asked yet wait in a shuffled list and are introduced whenever
+# no seen item is due, and at least every `new_every` rounds so that a few
+# items the learner keeps missing cannot crowd out the rest. Requeued
+# entries are not removed from the heap; stale ones are recognised by their
+# version and skipped when they reach the top.
+import heapq
+import random
+
+INTERVALS = (1, 3, 7, 15, 31, 63, 127, 255, 511, 1023)  # Rounds until an item in box i comes back
+
+
+# What the scheduler knows about one item
+class Card:
+    __slots__ = ('item', 'box', 'lapses', 'due')
+
+    def __init__(self, item, box=0, lapses=0, due=0):
+        self.item = item
+        self.box = box
+        self.lapses = lapses
+        self.due = due
+
+
+class LeitnerScheduler:
+    # `items` are the category's item ids; `state` maps ids to saved
+    # (box, lapses, due) and `clock` is the saved round counter. `save(card,
+    # clock)` is called whenever a card changes, to persist it.
+    def __init__(self, items, state=None, clock=0, rng=None, save=None, new_every=4):
+        self.rng = rng if rng is not None else random  # Global random unless given one
+        self.clock = clock
+        self.save = save
+        self.new_every = new_every
+        self._reviews = 0  # Reviews asked since the last new item
+        self.cards = {}
+        self._version = {}
+        self._heap = []
+        self._new = []
+        self.current = None
+        self._missed = False
+        state = state or {}
+        for item in items:
+            saved = state.get(item)
+            if saved is None:
+                self.cards[item] = Card(item)
+                self._new.append(item)
+            else:
+                card = self.cards[item] = Card(item, *saved)
+                self._version[item] = 0
+                self._heap.append(self._entry(card))
+        heapq.heapify(self._heap)
+        self.rng.shuffle(self._new)
+
+    def _entry(self, card):
+        return (card.due, -card.lapses, self.rng.random(), self._version[card.item], card.item)
+
+    def _push(self, card):
+        self._version[card.item] = self._version.get(card.item, -1) + 1
+        heapq.heappush(self._heap, self._entry(card))
+
+    # Pop the earliest live heap entry, or None
+    def _pop(self):
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if entry[3] == self._version.get(entry[4]):
+                return entry[4]
+        return None
+
+    def _peek_due(self):
+        while self._heap and self._heap[0][3] != self._version.get(self._heap[0][4]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    # Choose the next item to ask about: a due review first (unless a new
+    # item is owed), then a new item, otherwise the review that is due
+    # soonest. The item being asked about is out of the queue until record()
+    # ends its round.
+    def next(self):
+        if self.current is not None:
+            self._requeue(self.cards[self.current])
+        due = self._peek_due()
+        new_owed = self._new and self._reviews >= self.new_every - 1
+        if due is not None and due <= self.clock and not new_owed:
+            item = self._pop()
+            self._reviews += 1
+        elif self._new:
+            item = self._new.pop()
+            self._reviews = 0
+        else:
+            item = self._pop()
+        self.current = item
+        self._missed = False
+        return item
+
+    # Record an answer for the current item. A wrong answer counts as one
+    # lapse per round; the right answer ends the round and requeues the item.
+    def record(self, correct):
+        card = self.cards[self.current]
+        if not correct:
+            if not self._missed:
+                self._missed = True
+                card.box = 0
+                card.lapses += 1
+                if self.save:
+                    self.save(card, self.clock)
+            return
+        if not self._missed:
+            card.box = min(card.box + 1, len(INTERVALS) - 1)
+        self.clock += 1
+        self._requeue(card)
+        self.current = None
+
+    def _requeue(self, card):
+        card.due = self.clock + INTERVALS[card.box]
+        self._push(card)
+        if self.save:
+            self.save(card, self.clock)
@@ -1,6 +1,8 @@
+import asyncio
+
 import zaid
 
 if __name__ == "__main__":
-    zaid.main()
+    asyncio.run(zaid.main())
 
 
@@ -0,0 +1,79 @@
+# Idle-aware frame pacing for the game loops.
+#
+# While something is moving (an animation, a scroll, assets streaming in) the
+# loop runs at its full frame rate. Once the screen is static, the next
+# event fetch instead blocks in pygame.event.wait() until input arrives, the
+# idle timeout passes, or a deadline the game asked for comes up (e.g. the
+# next tick of an on-screen timer). An idle game then uses almost no CPU.
+# In the browser the page must never block, so an idle frame ends with an
+# asyncio sleep instead; input there is picked up within WEB_IDLE_MS.
+#
+# The loop calls, once per frame:
+#
+#   events = event_source.get(pacer.wait_ms)
+#   ...
+#   pacer.end_frame(active, wake_in=None)
+#   await asyncio.sleep(pacer.sleep_s)     # async loops only
+#
+# The pacer also counts frames and the CPU time of the session; report()
+# gives the average fps and how much of the session was spent idle.
+import sys
+import time
+
+import pygame
+
+IS_WEB = sys.platform == "emscripten"
+IDLE_TIMEOUT_MS = 1000  # Longest wait without any event or deadline
+WEB_IDLE_MS = 50  # Idle sleep per frame in the browser
+
+
+class FramePacer:
+    # `source` is the loop's event source (see replay.py); fps=0 runs
+    # uncapped and never waits, for benchmarks
+    def __init__(self, source, fps, idle_timeout=IDLE_TIMEOUT_MS):
+        self.source = source
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.clock = pygame.time.Clock()
+        self.wait_ms = 0
+        self.sleep_s = 0
+        self.frames = 0
+        self.idle_frames = 0
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    # End a frame. `active` keeps the loop at full rate; otherwise the next
+    # get() may block until an event, the idle timeout or `wake_in` ms from now
+    def end_frame(self, active, wake_in=None):
+        self.frames += 1
+        if active or not self.fps:
+            self.source.tick(self.clock, self.fps)
+            self.wait_ms = 0
+            self.sleep_s = 0
+            return
+        self.idle_frames += 1
+        self.source.tick(self.clock, 0)  # Keep the clock's measurements; the wait happens in get()
+        timeout = self.idle_timeout if wake_in is None else max(1, min(self.idle_timeout, int(wake_in)))
+        if IS_WEB:
+            self.wait_ms = 0
+            self.sleep_s = min(timeout, WEB_IDLE_MS) / 1000
+        else:
+            self.wait_ms = timeout
+            self.sleep_s = 0
+
+    def summary(self):
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        return {
+            'frames': self.frames,
+            'idle_frames': self.idle_frames,
+            'wall_s': wall,
+            'cpu_s': cpu,
+            'cpu_percent': 100 * cpu / wall if wall else 0.0,
+            'mean_fps': self.frames / wall if wall else 0.0,
+        }
+
+    def report(self):
+        stats = self.summary()
+        return (f"{stats['frames']} frames in {stats['wall_s']:.1f} s ({stats['mean_fps']:.1f} fps average, "
+                f"{stats['idle_frames']} idle), CPU {stats['cpu_s']:.2f} s ({stats['cpu_percent']:.1f}%)")
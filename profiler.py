@@ -0,0 +1,158 @@
+# Opt-in frame-time instrumentation for the game loops.
+#
+# The loop calls begin_frame() at the top of each frame and mark(phase) after
+# each phase; the time since the previous mark is charged to that phase.
+# Rolling percentiles are kept per phase in a ring buffer, F3 toggles an
+# on-screen overlay, and the per-frame trace is written on close().
+#
+# Set ZAID_PROFILE=1 to enable it, or ZAID_PROFILE=trace.json / trace.csv to
+# also dump the trace there on exit. When it is off, create_profiler() returns
+# a NullProfiler whose methods do nothing, so the calls can stay in
+# production builds.
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+from fonts import get_font, render_text
+
+OVERLAY_KEY = pygame.K_F3
+
+
+class NullProfiler:
+    enabled = False
+    overlay_visible = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def handle_event(self, event):
+        return False
+
+    def overlay_surface(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class FrameProfiler:
+    enabled = True
+
+    def __init__(self, name, window=300, trace_path=None, max_trace_frames=200000):
+        self.name = name
+        self.window = window
+        self.trace_path = trace_path
+        self.phases = []
+        self._samples = {}
+        self._trace = deque(maxlen=max_trace_frames)
+        self._current = None
+        self._last = None
+        self._frame_start = None
+        self._session_start = time.perf_counter()
+        self.frames = 0
+        self.overlay_visible = False
+        self._overlay = None
+        self._overlay_time = 0.0
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        if self._current is not None:
+            self._end_frame(now)
+        self._current = {}
+        self._frame_start = self._last = now
+
+    def mark(self, phase):
+        if self._current is None:
+            return
+        now = time.perf_counter()
+        self._current[phase] = self._current.get(phase, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def _end_frame(self, now):
+        frame = dict(self._current, frame=(now - self._frame_start) * 1000)
+        for phase, value in frame.items():
+            if phase not in self._samples:
+                self._samples[phase] = deque(maxlen=self.window)
+                self.phases.append(phase)
+            self._samples[phase].append(value)
+        self._trace.append(((self._frame_start - self._session_start) * 1000, frame))
+        self.frames += 1
+
+    # (p50, p95, p99) in milliseconds over the ring buffer
+    def percentiles(self, phase):
+        samples = sorted(self._samples.get(phase, ()))
+        if not samples:
+            return 0.0, 0.0, 0.0
+        pick = lambda fraction: samples[min(len(samples) - 1, int(fraction * len(samples)))]
+        return pick(0.50), pick(0.95), pick(0.99)
+
+    def summary(self):
+        return {phase: dict(zip(('p50', 'p95', 'p99'), self.percentiles(phase))) for phase in self.phases}
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.overlay_visible = not self.overlay_visible
+            self._overlay = None
+            return True
+        return False
+
+    # Overlay text as a surface, refreshed at most twice a second; None when hidden
+    def overlay_surface(self):
+        if not self.overlay_visible:
+            return None
+        now = time.perf_counter()
+        if self._overlay is None or now - self._overlay_time >= 0.5:
+            self._overlay_time = now
+            font = get_font(None, 22)
+            lines = [f"{self.name}  frames: {self.frames}   ms p50 / p95 / p99"]
+            for phase in self.phases:
+                p50, p95, p99 = self.percentiles(phase)
+                lines.append(f"{phase:>10}: {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+            rendered = [render_text(line, font, (255, 255, 255)) for line in lines]
+            width = max(surface.get_width() for surface in rendered) + 12
+            height = sum(surface.get_height() for surface in rendered) + 12
+            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 180))
+            y = 6
+            for surface in rendered:
+                overlay.blit(surface, (6, y))
+                y += surface.get_height()
+            self._overlay = overlay
+        return self._overlay
+
+    def dump(self, path):
+        columns = ['frame'] + [phase for phase in self.phases if phase != 'frame']
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['t_ms'] + columns)
+                for t, frame in self._trace:
+                    writer.writerow([f"{t:.3f}"] + [f"{frame.get(column, 0.0):.4f}" for column in columns])
+        else:
+            with open(path, 'w') as file:
+                json.dump({
+                    'name': self.name,
+                    'columns': ['t_ms'] + columns,
+                    'summary': self.summary(),
+                    'frames': [[round(t, 3)] + [round(frame.get(column, 0.0), 4) for column in columns]
+                               for t, frame in self._trace],
+                }, file)
+
+    def close(self):
+        if self.trace_path:
+            self.dump(self.trace_path)
+
+
+def create_profiler(name):
+    setting = os.environ.get('ZAID_PROFILE', '')
+    if not setting or setting == '0':
+        return NullProfiler()
+    trace_path = setting if setting.endswith(('.json', '.csv')) else None
+    return FrameProfiler(name, trace_path=trace_path)
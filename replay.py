@@ -0,0 +1,273 @@
+# Deterministic record and replay of game sessions.
+#
+# The game loops read input through an event source instead of calling
+# pygame.event.get() directly. Once per frame they call:
+#
+#   events = event_source.get(pacer.wait_ms)  # this frame's events; may block while idle
+#   now = event_source.ticks()               # the frame's timestamp in ms
+#   ...
+#   event_source.end_frame(state)            # a small tuple describing the game state
+#   pacer.end_frame(active)                  # frame pacing; calls event_source.tick(clock, fps)
+#
+# LiveSource just passes pygame through. Recorder does the same and also
+# writes every frame's timestamp, events and a CRC of the state to a
+# gzipped JSON-lines file, after seeding the global `random` module with a
+# seed it stores in the header. Inputs from outside the game (saved learner
+# progress) go through snapshot(), so a replay sees the same values.
+#
+# Replayer feeds a recording back headlessly, as fast as possible or at the
+# recorded pace. It raises ReplayMismatch on the first frame whose state
+# differs from the recording, and reports frame-time statistics.
+#
+#   python replay.py record zaid session.zrec
+#   python replay.py play session.zrec [--realtime] [--json stats.json]
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import sys
+import time
+import zlib
+
+import pygame
+
+FORMAT_VERSION = 1
+
+
+class ReplayMismatch(AssertionError):
+    pass
+
+
+class LiveSource:
+    def __init__(self):
+        self._now = 0
+
+    # With a timeout, block until an event arrives or `timeout` ms pass (see pacer.py)
+    def get(self, timeout=0):
+        events = []
+        if timeout > 0:
+            event = pygame.event.wait(timeout)
+            if event.type != pygame.NOEVENT:
+                events.append(event)
+        self._now = pygame.time.get_ticks()
+        return events + pygame.event.get()
+
+    def ticks(self):
+        return self._now
+
+    def snapshot(self, key, read):
+        return read()
+
+    def end_frame(self, state):
+        pass
+
+    def tick(self, clock, fps):
+        return clock.tick(fps)
+
+    def close(self):
+        pass
+
+
+# Keep event attributes that survive JSON; tuples come back as tuples
+def _encode_event(event):
+    attributes = {}
+    for key, value in event.dict.items():
+        if isinstance(value, tuple):
+            value = list(value)
+        if value is None or isinstance(value, (bool, int, float, str, list)):
+            attributes[key] = value
+    return [event.type, attributes]
+
+
+def _decode_event(record):
+    event_type, attributes = record
+    attributes = {key: tuple(value) if isinstance(value, list) else value for key, value in attributes.items()}
+    return pygame.event.Event(event_type, attributes)
+
+
+def state_digest(state):
+    return zlib.crc32(repr(state).encode('utf-8'))
+
+
+class Recorder(LiveSource):
+    def __init__(self, path, game, seed=None):
+        super().__init__()
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        random.seed(self.seed)
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+        header = {'format': FORMAT_VERSION, 'game': game, 'seed': self.seed, 'created': time.time()}
+        self._file.write(json.dumps(header) + '\n')
+        self._frame = None
+        self.frames = 0
+
+    def get(self, timeout=0):
+        events = super().get(timeout)
+        self._frame = {'t': self._now, 'e': [_encode_event(event) for event in events]}
+        return events
+
+    def snapshot(self, key, read):
+        value = _tuples_to_lists(read())  # Return what a replay will see
+        self._frame.setdefault('s', {})[key] = value
+        return value
+
+    def end_frame(self, state):
+        frame = self._frame
+        frame['d'] = state_digest(state)
+        if not frame['e']:
+            del frame['e']
+        self._file.write(json.dumps(frame, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.frames += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def load_recording(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        header = json.loads(file.readline())
+        if header.get('format') != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported recording format {header.get('format')}")
+        frames = [json.loads(line) for line in file if line.strip()]
+    return header, frames
+
+
+class Replayer(LiveSource):
+    def __init__(self, path, realtime=False):
+        super().__init__()
+        self.header, self.frames = load_recording(path)
+        self.realtime = realtime
+        random.seed(self.header['seed'])
+        self.index = -1
+        self.frame_times = []  # ms of work per frame, pacing excluded
+        self._frame_start = None
+        self._wall_start = None
+
+    # The recorded timestamps carry the timing, so idle waits are skipped
+    def get(self, timeout=0):
+        pygame.event.get()  # Drain the real queue so it cannot fill up
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.frame_times.append((now - self._frame_start) * 1000)
+        self.index += 1
+        if self.index >= len(self.frames):
+            self._frame_start = None
+            return [pygame.event.Event(pygame.QUIT)]
+        frame = self.frames[self.index]
+        self._now = frame['t']
+        if self.realtime:
+            if self._wall_start is None:
+                self._wall_start = now - self._now / 1000
+            delay = self._wall_start + self._now / 1000 - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        elif self._wall_start is None:
+            self._wall_start = now
+        self._frame_start = time.perf_counter()
+        return [_decode_event(record) for record in frame.get('e', ())]
+
+    def snapshot(self, key, read):
+        saved = self.frames[self.index].get('s', {})
+        if key not in saved:
+            raise ReplayMismatch(f"Frame {self.index}: the recording has no snapshot {key!r}")
+        return _tuples_to_lists(saved[key])
+
+    def end_frame(self, state):
+        if self.index >= len(self.frames):
+            return
+        expected = self.frames[self.index]['d']
+        digest = state_digest(state)
+        if digest != expected:
+            raise ReplayMismatch(f"Frame {self.index}: state {state!r} does not match the recording")
+
+    def tick(self, clock, fps):
+        return clock.tick()  # Never wait; get() does the pacing in real-time mode
+
+    def stats(self):
+        samples = sorted(self.frame_times)
+        pick = lambda fraction: samples[min(len(samples) - 1, int(fraction * len(samples)))] if samples else 0.0
+        wall = time.perf_counter() - self._wall_start if self._wall_start is not None else 0.0
+        return {
+            'frames': len(self.frame_times),
+            'recorded_ms': self.frames[-1]['t'] - self.frames[0]['t'] if self.frames else 0,
+            'wall_ms': wall * 1000,
+            'p50_ms': pick(0.50),
+            'p95_ms': pick(0.95),
+            'p99_ms': pick(0.99),
+            'max_ms': samples[-1] if samples else 0.0,
+            'mean_fps': len(samples) / wall if wall else 0.0,
+        }
+
+
+# JSON turns tuples into lists; snapshots are compared as JSON would store them
+def _tuples_to_lists(value):
+    if isinstance(value, dict):
+        return {key: _tuples_to_lists(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_tuples_to_lists(item) for item in value]
+    return value
+
+
+def run_zaid(source):
+    import zaid
+    zaid.event_source = source
+    asyncio.run(zaid.main())
+
+
+def run_battleship(source):
+    import game
+    game.init()
+    game.event_source = source
+    game.run()
+
+
+GAMES = {'zaid': run_zaid, 'battleship': run_battleship}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and replay game sessions')
+    commands = parser.add_subparsers(dest='command', required=True)
+    record = commands.add_parser('record', help='play a game and record the session')
+    record.add_argument('game', choices=list(GAMES))
+    record.add_argument('path', help='recording to write (.zrec)')
+    record.add_argument('--seed', type=int, help='random seed (default: chosen at random)')
+    play = commands.add_parser('play', help='replay a recording and check the game state')
+    play.add_argument('path')
+    play.add_argument('--realtime', action='store_true', help='replay at the recorded pace instead of flat out')
+    play.add_argument('--json', help='also write the frame statistics here')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        source = Recorder(args.path, args.game, args.seed)
+        try:
+            GAMES[args.game](source)
+        finally:
+            source.close()
+        print(f"Recorded {source.frames} frames of {args.game} (seed {source.seed}) to {args.path}")
+        return 0
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    # Replays start from empty progress and must not touch the real score file
+    os.environ['ZAID_SCORE_DB'] = ':memory:'
+    source = Replayer(args.path, args.realtime)
+    game = source.header['game']
+    try:
+        GAMES[game](source)
+    except ReplayMismatch as error:
+        print(f"Replay of {args.path} diverged. {error}")
+        return 1
+    stats = source.stats()
+    print(f"Replayed {stats['frames']} frames of {game}: p50 {stats['p50_ms']:.2f} ms, "
+          f"p95 {stats['p95_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, max {stats['max_ms']:.2f} ms, "
+          f"{stats['mean_fps']:.0f} fps")
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump({'recording': args.path, 'game': game, 'stats': stats}, file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
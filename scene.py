@@ -0,0 +1,115 @@
+import pygame
+
+
+# A retained-mode layer: each node is a surface at a position. Changing,
+# moving or removing a node marks its old and new rectangles dirty, and
+# render() repaints and pushes only those rectangles to the display.
+# A node with a `clip` rectangle is only painted inside it.
+class Scene:
+    def __init__(self, screen, background=None, fill_color=(255, 255, 255)):
+        self.screen = screen
+        self.background = background
+        self.fill_color = fill_color
+        self._nodes = {}  # name -> [surface, rect, layer, clip]
+        self._dirty = []
+        self._full_redraw = True
+
+    def set(self, name, surface, pos, layer=0, clip=None):
+        rect = surface.get_rect(topleft=pos)
+        node = self._nodes.get(name)
+        if node is not None:
+            if node[0] is surface and node[1] == rect and node[2] == layer and node[3] == clip:
+                return
+            self._dirty.append(self._visible(node))
+        node = self._nodes[name] = [surface, rect, layer, clip]
+        self._dirty.append(self._visible(node))
+
+    def move(self, name, pos):
+        node = self._nodes.get(name)
+        if node is None:
+            return
+        rect = node[0].get_rect(topleft=pos)
+        if rect != node[1]:
+            self._dirty.append(self._visible(node))
+            node[1] = rect
+            self._dirty.append(self._visible(node))
+
+    def remove(self, name):
+        node = self._nodes.pop(name, None)
+        if node is not None:
+            self._dirty.append(self._visible(node))
+
+    def clear(self):
+        self._nodes.clear()
+        self._full_redraw = True
+
+    def rect(self, name):
+        node = self._nodes.get(name)
+        return node[1] if node is not None else None
+
+    def __contains__(self, name):
+        return name in self._nodes
+
+    def names(self):
+        return list(self._nodes)
+
+    @staticmethod
+    def _visible(node):
+        return node[1].clip(node[3]) if node[3] is not None else node[1]
+
+    # Mark an area as needing a repaint (e.g. a node surface drawn into in place)
+    def mark_dirty(self, rect):
+        self._dirty.append(pygame.Rect(rect))
+
+    # Force the next render() to repaint the whole window, e.g. after
+    # something outside the scene has drawn over it
+    def invalidate(self):
+        self._full_redraw = True
+
+    def _paint(self, area):
+        if self.background is not None:
+            self.screen.blit(self.background, area, area)
+        else:
+            self.screen.fill(self.fill_color, area)
+        for surface, rect, _, clip in sorted(self._nodes.values(), key=lambda node: node[2]):
+            if rect.colliderect(area):
+                clipped = rect.clip(area)
+                if clip is not None:
+                    clipped = clipped.clip(clip)
+                    if not clipped:
+                        continue
+                self.screen.blit(surface, clipped, clipped.move(-rect.x, -rect.y))
+
+    # Repaint what changed. Returns the updated rectangles (empty when idle).
+    def render(self, update=True):
+        screen_rect = self.screen.get_rect()
+        if self._full_redraw:
+            self._full_redraw = False
+            self._dirty.clear()
+            self._paint(screen_rect)
+            if update:
+                pygame.display.update()
+            return [screen_rect]
+        if not self._dirty:
+            return []
+        rects = self._coalesce([r.clip(screen_rect) for r in self._dirty])
+        self._dirty.clear()
+        for rect in rects:
+            self._paint(rect)
+        if update:
+            pygame.display.update(rects)
+        return rects
+
+    # Merge overlapping rectangles so shared areas are painted once
+    @staticmethod
+    def _coalesce(rects):
+        merged = []
+        for rect in rects:
+            if rect.width <= 0 or rect.height <= 0:
+                continue
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect = rect.union(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
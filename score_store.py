@@ -0,0 +1,236 @@
+# Embedded SQLite store for Battleship scores, zaid answer statistics and
+# spaced-repetition progress.
+#
+# Every write goes through a queue. A background thread drains it and
+# commits each batch in a single transaction, so a crash never leaves a
+# half-written file behind, and record_*() never blocks the frame loop on
+# disk I/O. Where threads are not available (the pygbag web build), writes
+# are kept in memory until flush() is called at a natural pause (game over,
+# leaving a category). Reads call flush() first, so they always see earlier
+# writes. Top-N queries are served from an index, not by loading every score.
+#
+# On first open an existing high_scores.json is imported once, in the same
+# transaction that records the import.
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+SCHEMA_VERSION = 2
+DEFAULT_PATH = os.environ.get('ZAID_SCORE_DB', 'scores.db')
+LEGACY_JSON = 'high_scores.json'
+_FLUSH = object()  # Queue marker: commit what is queued without waiting out the batch window
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS battleship_scores (
+        id INTEGER PRIMARY KEY,
+        seconds INTEGER NOT NULL,
+        shots INTEGER,
+        board_size INTEGER,
+        created REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS battleship_scores_by_time ON battleship_scores (seconds, created)",
+    """CREATE TABLE IF NOT EXISTS item_stats (
+        category TEXT NOT NULL,
+        item TEXT NOT NULL,
+        correct INTEGER NOT NULL DEFAULT 0,
+        wrong INTEGER NOT NULL DEFAULT 0,
+        last_seen REAL,
+        PRIMARY KEY (category, item)
+    )""",
+    """CREATE TABLE IF NOT EXISTS review_cards (
+        category TEXT NOT NULL,
+        item TEXT NOT NULL,
+        box INTEGER NOT NULL,
+        lapses INTEGER NOT NULL,
+        due INTEGER NOT NULL,
+        PRIMARY KEY (category, item)
+    )""",
+    "CREATE TABLE IF NOT EXISTS review_clocks (category TEXT PRIMARY KEY, clock INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+]
+
+_INSERT_SCORE = "INSERT INTO battleship_scores (seconds, shots, board_size, created) VALUES (?, ?, ?, ?)"
+_UPSERT_ANSWER = """INSERT INTO item_stats (category, item, correct, wrong, last_seen) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (category, item) DO UPDATE SET
+        correct = correct + excluded.correct,
+        wrong = wrong + excluded.wrong,
+        last_seen = excluded.last_seen"""
+_SAVE_CARD = "INSERT OR REPLACE INTO review_cards (category, item, box, lapses, due) VALUES (?, ?, ?, ?, ?)"
+_SAVE_CLOCK = "INSERT OR REPLACE INTO review_clocks (category, clock) VALUES (?, ?)"
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class ScoreStore:
+    # background=None uses a writer thread unless running in the browser
+    def __init__(self, path=DEFAULT_PATH, legacy_json=LEGACY_JSON, background=None, batch_window=0.05):
+        self.path = path
+        self.batch_window = batch_window
+        self._lock = threading.Lock()  # Guards the connection in the in-memory fallback
+        self._connection = _connect(path)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+            self._connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        if legacy_json:
+            self._migrate_json(legacy_json)
+        if background is None:
+            background = sys.platform != 'emscripten'
+        self.background = background
+        self._queue = queue.Queue()
+        self._pending = []
+        self._writer = None
+        self.batches = 0
+        if background:
+            self._writer = threading.Thread(target=self._write_loop, name='score-store', daemon=True)
+            self._writer.start()
+
+    def _migrate_json(self, legacy_json):
+        if self._meta('migrated_json') is not None or not os.path.exists(legacy_json):
+            return
+        try:
+            with open(legacy_json, 'r') as file:
+                scores = [int(score) for score in json.load(file)]
+        except (OSError, ValueError, TypeError) as error:
+            print(f"Not importing {legacy_json}: {error}")
+            return
+        now = time.time()
+        with self._connection:
+            self._connection.executemany(_INSERT_SCORE, [(score, None, None, now) for score in scores])
+            self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_json', ?)",
+                                     (legacy_json,))
+
+    def _meta(self, key):
+        row = self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    # Writes
+
+    def _submit(self, statement, params):
+        if self.background:
+            self._queue.put((statement, params))
+        else:
+            self._pending.append((statement, params))
+
+    def record_score(self, seconds, shots=None, board_size=None):
+        self._submit(_INSERT_SCORE, (int(seconds), shots, board_size, time.time()))
+
+    def record_answer(self, category, item, correct):
+        self._submit(_UPSERT_ANSWER, (category, item, 1 if correct else 0, 0 if correct else 1, time.time()))
+
+    # Spaced-repetition state of one item (see leitner.py) and the category's round counter
+    def save_review(self, category, item, box, lapses, due, clock):
+        self._submit(_SAVE_CARD, (category, item, box, lapses, due))
+        self._submit(_SAVE_CLOCK, (category, clock))
+
+    def _commit(self, batch):
+        with self._lock, self._connection:
+            for statement, params in batch:
+                self._connection.execute(statement, params)
+        self.batches += 1
+
+    # Writer thread: wait for a write, gather whatever else arrives within
+    # batch_window, then commit them together. A flush marker ends the
+    # window early, so flush() only waits for the commit itself.
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            if item is _FLUSH:
+                self._queue.task_done()
+                continue
+            batch = [item]
+            markers = 0
+            deadline = time.monotonic() + self.batch_window
+            stop = False
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                if item is _FLUSH:
+                    markers += 1
+                    break
+                batch.append(item)
+            try:
+                self._commit(batch)
+            except sqlite3.Error as error:
+                print(f"Could not save scores: {error}")
+            for _ in range(len(batch) + markers + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    # Make sure every write so far is committed. With the writer thread this
+    # waits for the commit of the current batch (about a millisecond), not the
+    # batch window; the game loops only call it where there is no writer
+    def flush(self):
+        if self.background:
+            if self._writer is not None and self._writer.is_alive():
+                self._queue.put(_FLUSH)
+            self._queue.join()
+        elif self._pending:
+            batch, self._pending = self._pending, []
+            self._commit(batch)
+
+    def close(self):
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self.flush()
+        self._connection.close()
+
+    # Reads
+
+    def top_scores(self, limit=5):
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT seconds FROM battleship_scores ORDER BY seconds, created LIMIT ?", (limit,)).fetchall()
+        return [row[0] for row in rows]
+
+    # {item: (correct, wrong, last_seen)} for one zaid category
+    def item_stats(self, category):
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT item, correct, wrong, last_seen FROM item_stats WHERE category = ?", (category,)).fetchall()
+        return {item: (correct, wrong, last_seen) for item, correct, wrong, last_seen in rows}
+
+    # ({item: (box, lapses, due)}, clock) for one zaid category
+    def review_state(self, category):
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT item, box, lapses, due FROM review_cards WHERE category = ?", (category,)).fetchall()
+            clock = self._connection.execute(
+                "SELECT clock FROM review_clocks WHERE category = ?", (category,)).fetchone()
+        return {item: (box, lapses, due) for item, box, lapses, due in rows}, clock[0] if clock else 0
+
+
+_default = None
+
+
+# The store shared by the games, opened on first use and closed at exit
+def default_store():
+    global _default
+    if _default is None:
+        _default = ScoreStore()
+        atexit.register(_default.close)
+    return _default
+
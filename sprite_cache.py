@@ -0,0 +1,61 @@
+import pygame
+
+
+# Cache of scaled, display-format surfaces keyed by (path, size).
+# Each image is decoded once per target size; the full-resolution original
+# is dropped as soon as the scaled copy has been made.
+class SpriteCache:
+    def __init__(self):
+        self._surfaces = {}
+        self.hits = 0
+        self.misses = 0
+
+    # `load` opens the original when `path` is only a cache key (e.g. an asset pack entry)
+    def get(self, path, size=None, load=None):
+        key = (path, size)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = load() if load is not None else pygame.image.load(path)  # FileNotFoundError propagates to the caller
+        if size is not None and surface.get_size() != size:
+            surface = pygame.transform.scale(surface, size)
+        surface = self._to_display_format(surface)
+        self._surfaces[key] = surface
+        return surface
+
+    def discard(self, path):
+        for key in [key for key in self._surfaces if key[0] == path]:
+            del self._surfaces[key]
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def __contains__(self, key):
+        return key in self._surfaces
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    @staticmethod
+    def _to_display_format(surface):
+        # convert()/convert_alpha() need a display mode; keep the surface as-is otherwise
+        if pygame.display.get_surface() is None:
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def memory_bytes(self):
+        return sum(s.get_pitch() * s.get_height() for s in self._surfaces.values())
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'memory_bytes': self.memory_bytes(),
+        }
@@ -0,0 +1,76 @@
+import pytest
+
+import assetpack
+from assetpack import AssetPack, open_pack, write_pack
+
+ENTRIES = [('images/a.png', b'\x89PNG fake image', 'image'), ('sounds/b.wav', b'RIFF' + bytes(range(200)), 'sound'),
+           ('empty.txt', b'', 'other')]
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    path = tmp_path / 'assets.pak'
+    write_pack(str(path), ENTRIES)
+    return path
+
+
+def test_round_trip(pack_path):
+    pack = open_pack(str(pack_path))
+    try:
+        assert len(pack) == len(ENTRIES)
+        assert pack.names() == [name for name, _, _ in ENTRIES]
+        for name, data, kind in ENTRIES:
+            assert name in pack
+            assert pack.type(name) == kind
+            assert bytes(pack.view(name)) == data
+            file = pack.open(name)
+            assert file.read() == data
+            file.seek(1)
+            assert file.read(3) == data[1:4]
+            file.close()
+        assert 'missing.png' not in pack
+    finally:
+        pack.close()
+
+
+def test_missing_pack_is_none(tmp_path):
+    assert open_pack(str(tmp_path / 'nothing.pak')) is None
+
+
+def corrupt(path, how):
+    data = path.read_bytes()
+    if how == 'empty':
+        data = b''
+    elif how == 'short header':
+        data = data[:6]
+    elif how == 'bad magic':
+        data = b'NOPE' + data[4:]
+    elif how == 'bad version':
+        data = data[:4] + b'\x63\x00' + data[6:]
+    elif how == 'truncated index':
+        data = data[:20]
+    elif how == 'truncated data':
+        data = data[:-10]
+    elif how == 'garbled index':
+        data = data[:12] + b'#' + data[13:]
+    path.write_bytes(data)
+
+
+@pytest.mark.parametrize('how', ['empty', 'short header', 'bad magic', 'bad version', 'truncated index',
+                                 'truncated data', 'garbled index'])
+def test_corrupt_pack_falls_back_to_loose_files(pack_path, how, capsys):
+    corrupt(pack_path, how)
+    assert open_pack(str(pack_path)) is None
+    assert 'Not using asset pack' in capsys.readouterr().out
+
+
+def test_rejected_pack_closes_its_file(pack_path, monkeypatch):
+    corrupt(pack_path, 'bad magic')
+    opened, mapped = [], []
+    real_open, real_mmap = open, assetpack.mmap.mmap
+    monkeypatch.setattr('builtins.open', lambda *a, **k: opened.append(real_open(*a, **k)) or opened[-1])
+    monkeypatch.setattr(assetpack.mmap, 'mmap', lambda *a, **k: mapped.append(real_mmap(*a, **k)) or mapped[-1])
+    with pytest.raises(ValueError):
+        AssetPack(str(pack_path))
+    assert opened and all(file.closed for file in opened)
+    assert mapped and all(data.closed for data in mapped)
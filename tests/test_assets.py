@@ -0,0 +1,104 @@
+import asyncio
+import os
+import wave
+
+import pygame
+import pytest
+
+from assets import AssetManager
+from sprite_cache import SpriteCache
+
+
+@pytest.fixture
+def manager(tmp_path):
+    pygame.display.init()
+    manager = AssetManager(SpriteCache(), verbose=False)
+    for name in ('a', 'b', 'c'):
+        images = {}
+        for i in range(4):
+            path = os.path.join(tmp_path, f'{name}{i}.png')
+            pygame.image.save(pygame.Surface((32, 32)), path)
+            images[i] = path
+        manager.register(name, images=images)
+    yield manager
+    pygame.display.quit()
+
+
+def category_bytes(manager):
+    manager.load('a')
+    size = manager.category('a').memory_bytes
+    manager.unload('a')
+    return size
+
+
+def test_least_recently_used_category_is_evicted(manager):
+    manager.budget_bytes = int(category_bytes(manager) * 2.5)
+    for name in ('a', 'b', 'c'):
+        manager.load(name)
+    assert manager.stats()['loaded'] == ['b', 'c']
+    assert manager.category('a').images == {}
+
+
+def test_pinned_category_survives_going_over_budget(manager):
+    manager.budget_bytes = int(category_bytes(manager) * 1.5)
+    images = manager.load('a').images
+    manager.pin('a')
+    manager.load('b')  # Over budget, but 'a' is pinned and 'b' is the one being loaded
+    manager.load('c')
+    assert manager.is_loaded('a') and not manager.is_loaded('b') and manager.is_loaded('c')
+    assert len(images) == 4  # Callers holding the images dict still see every image
+    manager.unpin('a')
+    assert not manager.is_loaded('a')  # Evicted as soon as the pin is released
+    assert manager.is_loaded('c')
+
+
+def test_pins_nest(manager):
+    manager.budget_bytes = 0
+    manager.pin('a')
+    manager.pin('a')
+    manager.load('a')
+    manager.unpin('a')
+    manager.load('b')
+    assert manager.is_loaded('a')
+    manager.unpin('a')
+    assert not manager.is_loaded('a')
+    assert manager.stats()['pinned'] == []
+
+
+def write_wav(path, seconds=0.1, rate=22050):
+    with wave.open(path, 'wb') as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(rate)
+        file.writeframes(b'\0\0' * int(seconds * rate))
+
+
+def test_concurrent_loads_of_one_category_decode_each_file_once(tmp_path, monkeypatch):
+    pygame.mixer.init(22050, -16, 1)
+    try:
+        sounds = {}
+        for i in range(5):
+            sounds[i] = os.path.join(tmp_path, f'{i}.wav')
+            write_wav(sounds[i])
+        manager = AssetManager(SpriteCache(), verbose=False)
+        manager.register('letters', sounds=sounds)
+        decoded = []
+        real_sound = pygame.mixer.Sound
+        monkeypatch.setattr(pygame.mixer, 'Sound', lambda *a, **k: decoded.append(a) or real_sound(*a, **k))
+
+        async def session():
+            prefetch = manager.prefetch('letters')
+            await asyncio.sleep(0)  # The prefetch is part way through the category
+            await manager.load_async('letters')  # A click on the same category
+            await prefetch
+
+        asyncio.run(session())
+        assert len(decoded) == 5
+        category = manager.category('letters')
+        assert category.sound_bytes == 5 * int(0.1 * 22050) * 2
+        manager.unload('letters')
+        asyncio.run(manager.load_async('letters'))  # A later load reads the files again
+        assert len(decoded) == 10
+        assert category.sound_bytes == 5 * int(0.1 * 22050) * 2
+    finally:
+        pygame.mixer.quit()
@@ -0,0 +1,203 @@
+import random
+
+import pytest
+
+from battleship_board import Board, PlacementError, _surroundings, iter_bits, place_fleet
+
+
+# Cells of every ship on the board, as lists of (row, col)
+def ship_cells(board):
+    return [board.cells(mask) for mask in board.ship_masks]
+
+
+def is_straight(cells):
+    rows = {row for row, _ in cells}
+    cols = {col for _, col in cells}
+    if len(rows) == 1:
+        return sorted(cols) == list(range(min(cols), min(cols) + len(cells)))
+    if len(cols) == 1:
+        return sorted(rows) == list(range(min(rows), min(rows) + len(cells)))
+    return False
+
+
+def touching(a, b):
+    return any(abs(r1 - r2) <= 1 and abs(c1 - c2) <= 1 for r1, c1 in a for r2, c2 in b)
+
+
+# Every layout of `lengths` on an empty rows x cols board, tried exhaustively
+def brute_force_fits(rows, cols, lengths, no_touch):
+    board = Board(rows, cols)
+    placements = {}
+    for length in set(lengths):
+        masks = set()
+        for row in range(rows):
+            for col in range(cols):
+                for horizontal in (True, False):
+                    mask = board.ship_mask(row, col, length, horizontal)
+                    if mask is not None:
+                        masks.add(mask)
+        placements[length] = masks
+
+    def search(depth, blocked):
+        if depth == len(lengths):
+            return True
+        for mask in placements[lengths[depth]]:
+            if mask & blocked:
+                continue
+            area = _surroundings(board, mask) if no_touch else mask
+            if search(depth + 1, blocked | area):
+                return True
+        return False
+
+    return search(0, 0)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_ships_are_straight_with_the_requested_lengths(seed):
+    board = Board(8, 10)
+    lengths = [5, 4, 3, 3, 2]
+    ships = place_fleet(board, lengths, seed=seed)
+    assert len(ships) == len(lengths)
+    cells = ship_cells(board)
+    assert sorted(len(ship) for ship in cells) == sorted(lengths)
+    assert all(is_straight(ship) for ship in cells)
+    assert bin(board.ships).count('1') == sum(lengths)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_no_touch_keeps_ships_apart(seed):
+    board = Board(7, 9)
+    place_fleet(board, [4, 3, 3, 2, 2, 1], seed=seed, no_touch=True)
+    cells = ship_cells(board)
+    for i, a in enumerate(cells):
+        for b in cells[i + 1:]:
+            assert not touching(a, b)
+
+
+def test_no_touch_keeps_away_from_ships_already_on_the_board():
+    for seed in range(20):
+        board = Board(6, 6)
+        existing = board.add_ship(board.ship_mask(2, 2, 2, True))
+        place_fleet(board, [3, 2, 2], seed=seed, no_touch=True)
+        cells = ship_cells(board)
+        for other in range(board.ship_count):
+            if other != existing:
+                assert not touching(cells[existing], cells[other])
+
+
+def test_same_seed_same_layout():
+    layouts = []
+    for _ in range(2):
+        board = Board(10)
+        place_fleet(board, [5, 4, 3, 3, 2], seed=42, no_touch=True)
+        layouts.append(board.ship_masks)
+    assert layouts[0] == layouts[1]
+
+
+# Tight fleets force backtracking; excluding a failed position for later
+# ships of the same length must never rule out the only layouts left
+@pytest.mark.parametrize('rows, cols, lengths, no_touch', [
+    (5, 5, [5, 5, 5, 5, 5], False),
+    (5, 5, [5, 5, 5], True),
+    (5, 5, [5, 5, 5, 5], True),
+    (4, 4, [2, 2, 2, 2], True),
+    (4, 4, [3, 3, 3, 3, 2, 2], False),
+    (3, 5, [3, 3, 2, 2, 2, 1], False),
+    (4, 5, [3, 2, 2, 1, 1], True),
+    (4, 5, [3, 2, 2, 2, 1], True),
+    (3, 3, [2, 2, 2, 2], False),
+    (3, 3, [1, 1, 1, 1], True),
+    (3, 3, [1, 1, 1, 1, 1], True),
+])
+def test_finds_a_layout_exactly_when_one_exists(rows, cols, lengths, no_touch):
+    expected = brute_force_fits(rows, cols, sorted(lengths, reverse=True), no_touch)
+    for seed in range(10):
+        board = Board(rows, cols)
+        if expected:
+            place_fleet(board, lengths, seed=seed, no_touch=no_touch, max_backtracks=100000)
+            assert bin(board.ships).count('1') == sum(lengths)
+        else:
+            with pytest.raises(PlacementError):
+                place_fleet(board, lengths, seed=seed, no_touch=no_touch, max_backtracks=100000)
+
+
+def test_random_small_fleets_match_brute_force():
+    rng = random.Random(7)
+    for _ in range(60):
+        rows, cols = rng.randint(2, 5), rng.randint(2, 5)
+        lengths = sorted((rng.randint(1, max(rows, cols)) for _ in range(rng.randint(1, 5))), reverse=True)
+        no_touch = rng.random() < 0.5
+        if sum(lengths) > rows * cols:
+            continue
+        expected = brute_force_fits(rows, cols, lengths, no_touch)
+        board = Board(rows, cols)
+        try:
+            place_fleet(board, lengths, seed=rng.randrange(1000), no_touch=no_touch, max_backtracks=100000)
+            found = True
+        except PlacementError:
+            found = False
+        assert found == expected, (rows, cols, lengths, no_touch)
+
+
+def test_placement_errors():
+    with pytest.raises(PlacementError):
+        place_fleet(Board(5), [3, 0])
+    with pytest.raises(PlacementError):
+        place_fleet(Board(3), [3, 3, 3, 1])  # 10 cells on a 9-cell board
+    with pytest.raises(PlacementError):
+        place_fleet(Board(5), [6])  # Longer than the board
+    with pytest.raises(PlacementError):
+        place_fleet(Board(2), [1, 1], no_touch=True)  # Every cell touches every other
+    board = Board(3)
+    board.add_ship(board.ship_mask(1, 0, 3, True))
+    with pytest.raises(PlacementError):
+        place_fleet(board, [1], no_touch=True)  # The middle row blocks everything
+
+
+def test_failed_placement_leaves_the_board_unchanged():
+    board = Board(4)
+    board.add_ship(board.ship_mask(1, 1, 2, True))
+    ships, masks = board.ships, list(board.ship_masks)
+    with pytest.raises(PlacementError):
+        place_fleet(board, [4, 4, 4], seed=1, no_touch=True)  # Fits by cell count, not by layout
+    assert board.ships == ships and board.ship_masks == masks
+
+
+@pytest.mark.parametrize('rows, cols', [(1, 1), (1, 6), (6, 1), (4, 7), (7, 4), (8, 8)])
+def test_surroundings_are_the_eight_neighbours_without_wrapping(rows, cols):
+    board = Board(rows, cols)
+    for index in range(board.size):
+        row, col = board.cell(index)
+        expected = 0
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if board.in_bounds(row + dr, col + dc):
+                    expected |= board.bit(row + dr, col + dc)
+        assert _surroundings(board, 1 << index) == expected, (row, col)
+
+
+def test_surroundings_of_a_ship_on_the_edge():
+    board = Board(4, 5)
+    mask = board.ship_mask(0, 3, 2, True)  # Top-right corner, horizontal
+    area = _surroundings(board, mask)
+    assert sorted(board.cells(area)) == [(0, 2), (0, 3), (0, 4), (1, 2), (1, 3), (1, 4)]
+    assert list(iter_bits(area)) == sorted(board.index(r, c) for r, c in board.cells(area))
+
+
+@pytest.mark.parametrize('row, col', [(0, 5), (5, 0), (0, -1), (-1, 0), (-1, -1), (5, 5), (0, 64)])
+def test_cells_off_the_board_are_rejected(row, col):
+    board = Board(5)
+    place_fleet(board, [3, 3], seed=0)
+    ships, shots, hits = board.ships, board.shots, board.hits
+    for query in (board.fire, board.bit, board.is_shot, board.is_ship, board.is_hit, board.ship_at, board.index):
+        with pytest.raises(ValueError, match='outside the 5x5 board'):
+            query(row, col)
+    assert (board.ships, board.shots, board.hits) == (ships, shots, hits)  # Nothing aliased into another cell
+
+
+def test_edge_cells_are_on_the_board():
+    board = Board(3, 4)
+    for row, col in [(0, 0), (0, 3), (2, 0), (2, 3)]:
+        assert board.fire(row, col) == 'miss'
+        assert board.is_shot(row, col)
+    assert bin(board.shots).count('1') == 4
@@ -0,0 +1,113 @@
+import random
+
+from leitner import INTERVALS, LeitnerScheduler
+
+
+def scheduler(items, state=None, clock=0, **kwargs):
+    saved = {}
+    save = lambda card, clock: saved.__setitem__(card.item, (card.box, card.lapses, card.due, clock))
+    return LeitnerScheduler(items, state, clock, rng=random.Random(0), save=save, **kwargs), saved
+
+
+def test_right_first_time_moves_up_a_box():
+    leitner, saved = scheduler(['a'])
+    assert leitner.next() == 'a'
+    leitner.record(True)
+    card = leitner.cards['a']
+    assert (card.box, card.lapses) == (1, 0)
+    assert leitner.clock == 1
+    assert card.due == leitner.clock + INTERVALS[1]
+    assert saved['a'] == (1, 0, card.due, 1)
+
+
+def test_wrong_answer_resets_the_box_and_counts_one_lapse_per_round():
+    leitner, saved = scheduler(['a'], state={'a': (4, 0, 0)}, clock=10)
+    assert leitner.next() == 'a'
+    leitner.record(False)
+    leitner.record(False)  # A second miss in the same round is not another lapse
+    assert (leitner.cards['a'].box, leitner.cards['a'].lapses) == (0, 1)
+    assert saved['a'][:2] == (0, 1)
+    leitner.record(True)  # Right in the end, but not first time: stays in box 0
+    card = leitner.cards['a']
+    assert (card.box, card.lapses) == (0, 1)
+    assert card.due == leitner.clock + INTERVALS[0] == 12
+
+
+def test_box_stops_at_the_last_interval():
+    last = len(INTERVALS) - 1
+    leitner, _ = scheduler(['a'], state={'a': (last, 0, 0)})
+    leitner.next()
+    leitner.record(True)
+    assert leitner.cards['a'].box == last
+    assert leitner.cards['a'].due == leitner.clock + INTERVALS[last]
+
+
+def test_due_reviews_come_before_reviews_not_yet_due():
+    state = {'later': (3, 0, 50), 'due': (2, 0, 5), 'soon': (1, 0, 20)}
+    leitner, _ = scheduler(list(state), state=state, clock=10)
+    assert leitner.next() == 'due'
+    leitner.record(True)
+    # Nothing else is due and there are no new items: the soonest comes next
+    assert leitner.next() == 'soon'
+
+
+def test_more_lapses_first_when_equally_due():
+    state = {'easy': (0, 0, 3), 'hard': (0, 5, 3), 'medium': (0, 2, 3)}
+    leitner, _ = scheduler(list(state), state=state, clock=3)
+    asked = []
+    for _ in range(3):
+        asked.append(leitner.next())
+        leitner.record(True)
+    assert asked == ['hard', 'medium', 'easy']
+
+
+def test_new_items_are_owed_every_new_every_rounds():
+    # Two items always due: without the quota new items would never be asked
+    state = {'x': (0, 3, 0), 'y': (0, 3, 0)}
+    new = ['n1', 'n2', 'n3']
+    leitner, _ = scheduler(list(state) + new, state=state, clock=0, new_every=4)
+    asked = []
+    for _ in range(12):
+        item = leitner.next()
+        asked.append(item)
+        leitner.record(False)
+        leitner.record(True)
+    positions = sorted(asked.index(item) for item in new)  # When each new item was first asked
+    assert all(later - earlier <= 4 for earlier, later in zip([-1] + positions, positions))
+
+
+def test_new_items_fill_in_when_no_review_is_due():
+    leitner, _ = scheduler(['seen', 'new'], state={'seen': (3, 0, 100)}, clock=0)
+    assert leitner.next() == 'new'
+
+
+def test_skipping_an_item_requeues_it():
+    leitner, _ = scheduler(['a', 'b'], state={'a': (0, 0, 0), 'b': (0, 0, 0)})
+    first = leitner.next()
+    second = leitner.next()  # No answer for `first`; it goes back in the queue
+    assert {first, second} == {'a', 'b'}
+    assert leitner.cards[first].due == leitner.clock + INTERVALS[0]
+    leitner.record(True)
+    assert leitner.next() == first
+
+
+def test_every_item_is_asked_and_state_round_trips():
+    items = [f'item{i}' for i in range(12)]
+    leitner, saved = scheduler(items)
+    rng = random.Random(1)
+    asked = set()
+    for _ in range(60):
+        item = leitner.next()
+        asked.add(item)
+        if rng.random() < 0.3:
+            leitner.record(False)
+        leitner.record(True)
+    assert asked == set(items)
+    # A scheduler built from the saved rows carries on from the same state
+    state = {item: row[:3] for item, row in saved.items()}
+    clock = max(row[3] for row in saved.values())
+    resumed, _ = scheduler(items, state=state, clock=clock)
+    assert clock == leitner.clock
+    for item in items:
+        card, again = leitner.cards[item], resumed.cards[item]
+        assert (card.box, card.lapses, card.due) == (again.box, again.lapses, again.due)
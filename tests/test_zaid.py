@@ -0,0 +1,33 @@
+import pygame
+import pytest
+
+import zaid
+
+
+@pytest.fixture
+def game(monkeypatch):
+    monkeypatch.setenv('ZAID_ASSET_BUDGET_MB', '1')  # Every category load goes over budget
+    zaid.init()
+    yield zaid
+    pygame.quit()
+    zaid.screen = zaid.scene_category = None  # The next init() starts over
+
+
+def test_category_on_screen_survives_eviction(game):
+    game.current_category = 'letters'
+    game.draw_items()
+    for name in ('numbers', 'who', 'feedback'):
+        game.assets.load(name)  # What the background prefetch does while the grid is up
+    assert game.assets.is_loaded('letters')
+    assert game.assets.stats()['evictions'] > 0
+    game.draw_items()  # Redraws from the same images
+    game.scroll.scroll_by(300)
+    game.draw_items()
+
+    # Once another category is shown, the first one can be evicted again
+    game.current_category = 'numbers'
+    game.draw_items()
+    game.assets.load('who')
+    assert not game.assets.is_loaded('letters')
+    game.current_category = 'letters'
+    game.draw_items()
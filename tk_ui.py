@@ -0,0 +1,69 @@
+# Main-thread helpers for the Tkinter Battleship.
+#
+# Tk widgets may only be touched from the thread running mainloop(), so
+# nothing here sleeps or starts threads: animations are chains of
+# root.after() callbacks and feedback goes to an in-window toast instead of
+# a modal dialog, so a guess never waits for anything.
+import tkinter as tk
+
+
+# Named root.after() callbacks that can be cancelled as a group, e.g. when a
+# game is restarted while a flash or a message is still pending
+class TkScheduler:
+    def __init__(self, root):
+        self.root = root
+        self._pending = {}  # after id -> tag
+
+    def later(self, delay, callback, tag=None):
+        def run():
+            self._pending.pop(after_id, None)
+            callback()
+        after_id = self.root.after(delay, run)
+        self._pending[after_id] = tag
+        return after_id
+
+    # Cancel every pending callback with `tag` (all of them when tag is None)
+    def cancel(self, tag=None):
+        for after_id, other in list(self._pending.items()):
+            if tag is None or other == tag:
+                self.root.after_cancel(after_id)
+                del self._pending[after_id]
+
+    # Show `colors` on the widget's background one after another, `interval`
+    # ms apart, ending on `final`. Starting a new flash on a widget replaces
+    # the one already running on it.
+    def flash(self, widget, colors, final, interval=100):
+        tag = ('flash', str(widget))
+        self.cancel(tag)
+        steps = list(colors) + [final]
+        widget.config(bg=steps[0])
+        for i, color in enumerate(steps[1:], start=1):
+            self.later(interval * i, lambda color=color: widget.config(bg=color), tag)
+
+
+# A message strip inside the window. show() replaces whatever is showing;
+# messages with a duration hide themselves, the others stay until replaced
+# or cleared.
+class Toast:
+    COLORS = {
+        'info': ('#4ECDC4', '#1E1E1E'),
+        'good': ('#FFD700', '#1E1E1E'),
+        'bad': ('#FF6B6B', '#FFFFFF'),
+    }
+
+    def __init__(self, root, scheduler, font=("Helvetica", 14, "bold")):
+        self.scheduler = scheduler
+        self.label = tk.Label(root, font=font, padx=16, pady=8, justify=tk.CENTER)
+
+    def show(self, text, kind='info', duration=2500):
+        background, foreground = self.COLORS[kind]
+        self.scheduler.cancel('toast')
+        self.label.config(text=text, bg=background, fg=foreground)
+        self.label.place(relx=0.5, rely=1.0, y=-16, anchor=tk.S)
+        self.label.lift()
+        if duration is not None:
+            self.scheduler.later(duration, self.clear, 'toast')
+
+    def clear(self):
+        self.scheduler.cancel('toast')
+        self.label.place_forget()
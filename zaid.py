@@ -1,29 +1,48 @@
+import asyncio
 import pygame
 import random
 import os
 import math
-from queue import Queue
 import sys
 
-# Initialize Pygame
-pygame.init()
+from animation import Animator, Sequence, Tween, ease_in_out_quad
+from assetpack import open_pack
+from assets import AssetManager, load_manifest
+from audio import FEEDBACK, PROMPT, AudioSequencer
+from content import ContentRegistry
+from fonts import get_font, render_text
+from grid import GridLayout, ScrollView
+from leitner import LeitnerScheduler
+from pacer import FramePacer
+from profiler import create_profiler
+from replay import LiveSource
+from scene import Scene
+from score_store import default_store
+from sprite_cache import SpriteCache
 
 # Detect web (pygbag/emscripten) and gate audio to avoid autoplay issues
 IS_WEB = sys.platform == "emscripten"
-SOUND_ENABLED = True
-try:
-    if IS_WEB:
-        # On web, don't initialize the mixer at start; defer/disable to avoid user-gesture blocks
-        SOUND_ENABLED = False
-    else:
-        pygame.mixer.init()
-except Exception:
-    SOUND_ENABLED = False
+SOUND_ENABLED = False
+audio_init_attempted = False
+
+# Function to start the mixer; browsers only allow it after a user gesture
+def ensure_audio():
+    global SOUND_ENABLED, audio_init_attempted
+    if not audio_init_attempted:
+        audio_init_attempted = True
+        try:
+            pygame.mixer.init()
+            SOUND_ENABLED = True
+        except Exception:
+            SOUND_ENABLED = False
+    return SOUND_ENABLED
+
+# Events that count as a user gesture for starting audio in the browser
+USER_GESTURES = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.FINGERDOWN)
 
-# Set up the game window
+# The game window; opened by init()
 WIDTH, HEIGHT = 1200, 900
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Arabic Learning Game")
+screen = None
 
 # Colors
 WHITE = (255, 255, 255)
@@ -37,138 +56,73 @@ GOLD = (255, 215, 0)
 DARK_GOLD = (218, 165, 32)
 SHADOW_COLOR = (169, 169, 169)
 
-# Background
-try:
-    background_img = pygame.image.load(os.path.join('images', 'abstract_pattern.png'))  # Add an abstract and colorful pattern image
-    background_img = pygame.transform.scale(background_img, (WIDTH, HEIGHT))
-except FileNotFoundError:
-    print("Background image 'abstract_pattern.png' not found.")
-    background_img = None
-
-# Load Arabic letters, numbers, and words
-letters = ['ا', 'ب', 'ت', 'ث', 'ج', 'ح', 'خ', 'د', 'ذ', 'ر', 'ز', 'س', 'ش', 'ص', 'ض', 'ط', 'ظ', 'ع', 'غ', 'ف', 'ق', 'ك', 'ل', 'م', 'ن', 'ه', 'و', 'ي']
-numbers = ['١', '٢', '٣', '٤', '٥', '٦', '٧', '٨', '٩', '١٠']  # Arabic numbers 1 to 10
-words = ['بيت', 'تفاح', 'مدرسة']  # Example Arabic words
-current_category = 'letters'
+# Size items are drawn at on the game screen
+ITEM_SIZE = (120, 120)
 
-letter_positions = []
+# Scaled, display-format copies of every image, built once per size
+sprites = SpriteCache()
 
-# Load sound files
-sounds = {}
+# Bundled assets live next to this file, or in PyInstaller's unpack folder in a frozen build
+BASE_DIR = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+BUNDLE_DIR = os.path.join(BASE_DIR, 'bundle')
 
-# Load multiple correct and wrong sound files (only if audio is enabled)
-correct_sounds = []
-wrong_sounds = []
-if SOUND_ENABLED:
-    for i in range(1, 4):  # Assuming there are 3 correct and 3 wrong sound files
-        try:
-            correct_sounds.append(pygame.mixer.Sound(os.path.join('sounds', f'correct_{i}.wav')))
-        except FileNotFoundError:
-            print(f"Correct sound 'correct_{i}.wav' not found.")
-        try:
-            wrong_sounds.append(pygame.mixer.Sound(os.path.join('sounds', f'wrong_{i}.wav')))
-        except FileNotFoundError:
-            print(f"Wrong sound 'wrong_{i}.wav' not found.")
-
-# Load general prompt sounds
-if SOUND_ENABLED:
-    try:
-        sounds['find_the_letter'] = pygame.mixer.Sound(os.path.join('sounds', 'find_the_letter.wav'))
-    except FileNotFoundError:
-        print("General prompt sound 'find_the_letter.wav' not found.")
-
-if SOUND_ENABLED:
-    try:
-        sounds['find_the_number'] = pygame.mixer.Sound(os.path.join('sounds', 'find_the_number.wav'))
-    except FileNotFoundError:
-        print("General prompt sound 'find_the_number.wav' not found.")
-
-if SOUND_ENABLED:
-    try:
-        sounds['find_whos_sound'] = pygame.mixer.Sound(os.path.join('sounds', 'find_whos_sound.wav'))
-    except FileNotFoundError:
-        print("General prompt sound 'find_whos_sound.wav' not found.")
-
-if SOUND_ENABLED:
-    for letter in letters:
-        try:
-            sounds[f'prompt_{letter}'] = pygame.mixer.Sound(os.path.join('sounds', f'prompt_{letter}.wav'))
-        except FileNotFoundError:
-            print(f"Sound for {letter} not found.")
+# Categories and their items, from the content packs in packs/ (see content.py)
+content = None
 
-if SOUND_ENABLED:
-    for i in range(1, 11):
-        try:
-            sounds[f'prompt_{i}'] = pygame.mixer.Sound(os.path.join('sounds', f'prompt_{i}.wav'))
-        except FileNotFoundError:
-            print(f"Sound for number {i} not found.")
-
-# Load arrow image
-arrow_img = pygame.image.load(os.path.join('images', 'arrow.png'))
-arrow_img = pygame.transform.scale(arrow_img, (50, 50))
-
-# Load images and sounds for "Who's Sound is This" category
-who_images = {}
-who_sounds = {}
-
-who_items = ['grand_grandma', 'grandma', 'grandpa', 'yaser', 'ammar', 'sumayah', 'anas', 'cow', 'dog', 'cat', 'fart']
-
-for item in who_items:
-    try:
-        who_images[item] = pygame.image.load(os.path.join('who_images', f'{item}.png'))
-    except FileNotFoundError:
-        print(f"Image for {item} not found.")
-    if SOUND_ENABLED:
-        try:
-            who_sounds[item] = pygame.mixer.Sound(os.path.join('who_sounds', f'{item}.wav'))
-        except FileNotFoundError:
-            print(f"Sound for {item} not found.")
-
-# Load images for letters, numbers, and words
-letter_images = {}
-for letter in letters:
-    try:
-        letter_images[letter] = pygame.image.load(os.path.join('letter_images', f'{letter}.png'))
-    except FileNotFoundError:
-        print(f"Image for {letter} not found.")
-
-number_images = {}
-number_image_names = ['one', 'two', 'three', 'four', 'five', 'six', 'seven', 'eight', 'nine', 'ten']
-for i, name in enumerate(number_image_names, start=1):
-    try:
-        number_images[numbers[i - 1]] = pygame.image.load(os.path.join('number_images', f'{name}.png'))
-    except FileNotFoundError:
-        print(f"Image for number {name} not found.")
-
-word_images = {}
-try:
-    word_images['بيت'] = pygame.image.load(os.path.join('word_images', 'house.png'))
-except FileNotFoundError:
-    print("Image for house not found.")
-try:
-    word_images['تفاح'] = pygame.image.load(os.path.join('word_images', 'apple.png'))
-except FileNotFoundError:
-    print("Image for apple not found.")
-try:
-    word_images['مدرسة'] = pygame.image.load(os.path.join('word_images', 'school.png'))
-except FileNotFoundError:
-    print("Image for school not found.")
-
-# Sound Queue to manage overlapping issues
-sound_queue = Queue()
+# Function to open the content packs; only the pack index is read here, each
+# pack's item list on first use
+def open_content():
+    global content
+    if content is None:
+        content = ContentRegistry(os.environ.get('ZAID_CONTENT_INDEX', os.path.join(BASE_DIR, 'packs', 'index.json')))
+    return content
+
+current_category = 'letters'
+
+# Function to declare every image and sound the game uses, grouped by category.
+# build_assets.py uses the same list to build the web/desktop bundle.
+def register_assets(manager):
+    # Background for the menu and game screens
+    manager.register(
+        'menu',
+        images={'background': os.path.join('images', 'abstract_pattern.png')},  # Add an abstract and colorful pattern image
+        image_size=(WIDTH, HEIGHT),
+        pinned=True,
+    )
+    # Arrow image and correct/wrong sounds, shared by every category
+    manager.register(
+        'feedback',
+        images={'arrow': os.path.join('images', 'arrow.png')},
+        sounds={f'{kind}_{i}': os.path.join('sounds', f'{kind}_{i}.wav') for kind in ('correct', 'wrong') for i in range(1, 4)},
+        image_size=(50, 50),
+        pinned=True,
+    )
+    # Every content category; keyed by item index and defined only when first loaded
+    open_content().register_assets(manager, ITEM_SIZE)
+
+# Asset manager, created by init(). Images and sounds are loaded per category
+# when it is first chosen; only the background is needed to show the menu.
+# Set ZAID_ASSET_BUDGET_MB to change how much decoded image/sound data is kept
+# before evicting categories. When build_assets.py has produced a bundle,
+# assets are read from its packed archive (one memory-mapped file) or,
+# failing that, through its manifest.
+assets = None
+
+# Background, set once the menu assets have loaded
+background_img = None
+
+# Correct or wrong feedback sounds ('correct' / 'wrong')
+def feedback_sounds(kind):
+    feedback = assets.load('feedback')
+    return [sound for key, sound in feedback.sounds.items() if key.startswith(kind)]
+
+# Prompts and feedback play on their own mixer channels; main() passes its
+# events to the sequencer, which starts the next queued sound when one ends
+sequencer = AudioSequencer()
 
 # Function to play a sequence of sounds
 def play_sounds_sequence(*sounds_to_play):
-    for sound in sounds_to_play:
-        if sound is not None:
-            sound_queue.put(sound)
-
-def play_sound_from_queue():
-    if not SOUND_ENABLED:
-        return
-    if not sound_queue.empty() and not pygame.mixer.get_busy():
-        sound = sound_queue.get()
-        sound.play()
+    sequencer.play(sounds_to_play, PROMPT)
 
 # Function to draw buttons for game selection
 def draw_buttons():
@@ -176,258 +130,417 @@ def draw_buttons():
         screen.blit(background_img, (0, 0))
     else:
         screen.fill(WHITE)
-    font = pygame.font.Font(pygame.font.match_font('arial'), 60)
-
-    # Button 1: Find the Letter
-    button_1 = pygame.Rect(400, 200, 400, 100)
-    shadow_1 = button_1.move(5, 5)  # Create shadow effect
-    pygame.draw.rect(screen, SHADOW_COLOR, shadow_1, border_radius=20)
-    pygame.draw.rect(screen, GOLD, button_1, border_radius=20)
-    pygame.draw.rect(screen, DARK_GOLD, button_1, width=5, border_radius=20)
-    text_1 = font.render('Find the Letter', True, BLACK)
-    screen.blit(text_1, (button_1.x + (button_1.width - text_1.get_width()) // 2, button_1.y + (button_1.height - text_1.get_height()) // 2))
-
-    # Button 2: Find the Number
-    button_2 = pygame.Rect(400, 350, 400, 100)
-    shadow_2 = button_2.move(5, 5)  # Create shadow effect
-    pygame.draw.rect(screen, SHADOW_COLOR, shadow_2, border_radius=20)
-    pygame.draw.rect(screen, GOLD, button_2, border_radius=20)
-    pygame.draw.rect(screen, DARK_GOLD, button_2, width=5, border_radius=20)
-    text_2 = font.render('Find the Number', True, BLACK)
-    screen.blit(text_2, (button_2.x + (button_2.width - text_2.get_width()) // 2, button_2.y + (button_2.height - text_2.get_height()) // 2))
-
-    # Button 3: Who's Sound is This
-    button_3 = pygame.Rect(400, 500, 400, 100)
-    shadow_3 = button_3.move(5, 5)  # Create shadow effect
-    pygame.draw.rect(screen, SHADOW_COLOR, shadow_3, border_radius=20)
-    pygame.draw.rect(screen, GOLD, button_3, border_radius=20)
-    pygame.draw.rect(screen, DARK_GOLD, button_3, width=5, border_radius=20)
-    text_3 = font.render("Who's Sound is This", True, BLACK)
-    screen.blit(text_3, (button_3.x + (button_3.width - text_3.get_width()) // 2, button_3.y + (button_3.height - text_3.get_height()) // 2))
+    font = get_font('arial', 60)
+
+    # One button per menu category, in pack index order
+    buttons = []
+    categories = content.menu_categories()
+    pitch = min(150, (HEIGHT - 250) // max(1, len(categories)))
+    for i, category in enumerate(categories):
+        button = pygame.Rect(400, 200 + i * pitch, 400, 100)
+        shadow = button.move(5, 5)  # Create shadow effect
+        pygame.draw.rect(screen, SHADOW_COLOR, shadow, border_radius=20)
+        pygame.draw.rect(screen, GOLD, button, border_radius=20)
+        pygame.draw.rect(screen, DARK_GOLD, button, width=5, border_radius=20)
+        text = render_text(category.title, font, BLACK)
+        screen.blit(text, (button.x + (button.width - text.get_width()) // 2, button.y + (button.height - text.get_height()) // 2))
+        buttons.append((category.id, button))
 
     pygame.display.update()
-    return button_1, button_2, button_3
+    return buttons
+
+# Back and Replay buttons on the game screen
+back_button = pygame.Rect(50, 800, 150, 50)
+replay_button = pygame.Rect(1000, 800, 150, 50)
+
+# Retained scene for the game screen, created by init(); only changed rectangles reach the display
+scene = None
+scene_category = None
+item_offsets = {}
+
+# Items are laid out on a grid above the buttons that scrolls with the mouse
+# wheel; only the rows inside item_viewport are in the scene at any time.
+# Item rects handed to the animations are grid (unscrolled) coordinates.
+item_viewport = pygame.Rect(0, 0, WIDTH, back_button.top - 10)
+grid = GridLayout(0, ITEM_SIZE, (170, 150), item_viewport, (100, 100))
+grid_items = []
+grid_index = {}
+grid_images = {}
+visible_items = set()
+scroll = ScrollView()
+
+# Running animations, advanced once per frame by main()
+animator = Animator()
+
+# Frame-time profiler; a no-op unless ZAID_PROFILE is set (F3 toggles its overlay)
+profiler = create_profiler('zaid')
+
+# Where input and frame timestamps come from; replay.py swaps in a recorder or a replayer
+event_source = LiveSource()
+
+# Spaced-repetition schedulers by category id, created with the saved
+# progress the first time a category is opened
+schedulers = {}
+
+# Function to get a category's scheduler; every change is saved through the score store
+def get_scheduler(category_id):
+    if category_id not in schedulers:
+        store = default_store()
+        state, clock = event_source.snapshot(f'review:{category_id}', lambda: store.review_state(category_id))
+        save = lambda card, clock: store.save_review(category_id, card.item, card.box, card.lapses, card.due, clock)
+        items = [item.id for item in shown_items(category_id)]
+        schedulers[category_id] = LeitnerScheduler(items, state, clock, save=save)
+    return schedulers[category_id]
+
+# Function to list a category's items that have an image. The others are
+# left out of the grid, so they are never asked about either.
+def shown_items(category_id):
+    images = assets.load(category_id).images
+    return [item for item in content.items(category_id) if item.index in images]
+
+# Function to pick the next item to ask about in a category (None if it has nothing to show)
+def next_item(category_id):
+    return content.item(category_id, get_scheduler(category_id).next())
+
+# Function to start pygame, open the window and set up the asset manager.
+# Importing this module does none of that; nothing is loaded here either,
+# run() streams the assets in behind the loading screen drawn at the end.
+def init():
+    global screen, assets, scene
+    if screen is not None:
+        return
+    pygame.init()
+    # On desktop the mixer can start right away; on web, run() starts it on the first click or key press
+    if not IS_WEB:
+        ensure_audio()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Arabic Learning Game")
+    assets = AssetManager(
+        sprites,
+        budget_bytes=int(os.environ.get('ZAID_ASSET_BUDGET_MB', 64)) * 1024 * 1024,
+        manifest=load_manifest(os.environ.get('ZAID_ASSET_MANIFEST', os.path.join(BUNDLE_DIR, 'manifest.json'))),
+        pack=open_pack(os.environ.get('ZAID_ASSET_PACK', os.path.join(BUNDLE_DIR, 'assets.pak'))),
+    )
+    register_assets(assets)
+    scene = Scene(screen, None, WHITE)
+    draw_loading_screen(0.0)
+
+# Function to draw the loading screen; after the first frame only the progress bar is pushed to the display
+loading_bar = pygame.Rect(WIDTH // 2 - 300, HEIGHT // 2 + 20, 600, 30)
+def draw_loading_screen(fraction):
+    if fraction == 0.0:
+        screen.fill(WHITE)
+        text = render_text("Loading...", get_font('arial', 60), BLACK)
+        screen.blit(text, ((WIDTH - text.get_width()) // 2, loading_bar.top - text.get_height() - 20))
+    pygame.draw.rect(screen, LIGHT_BLUE, loading_bar, border_radius=10)
+    if fraction > 0.0:
+        filled = loading_bar.copy()
+        filled.width = max(20, int(loading_bar.width * min(fraction, 1.0)))
+        pygame.draw.rect(screen, GOLD, filled, border_radius=10)
+    pygame.draw.rect(screen, DARK_GOLD, loading_bar, width=3, border_radius=10)
+    if fraction == 0.0:
+        pygame.display.update()
+    else:
+        pygame.display.update(loading_bar)
+
+# Function to load asset categories in order, advancing the loading screen after every file
+async def load_with_progress(*names):
+    total = max(1, sum(assets.pending_files(name) for name in names))
+    done = 0
+
+    def step():
+        nonlocal done
+        done += 1
+        draw_loading_screen(done / total)
+        pygame.event.pump()  # Keep the window responsive; events stay queued for the menu
+
+    for name in names:
+        await assets.load_async(name, on_step=step)
+
+# Function to load what the menu needs (the background) behind the loading screen
+async def load_menu():
+    global background_img
+    await load_with_progress('menu')
+    background_img = assets.category('menu').images.get('background')
+    scene.background = background_img
+
+# Function to pre-render a button (with its shadow) onto its own surface
+def make_button_surface(rect, text, font, color, border_color, border_width, radius):
+    surface = pygame.Surface((rect.width + 5, rect.height + 5), pygame.SRCALPHA)
+    button = pygame.Rect(0, 0, rect.width, rect.height)
+    pygame.draw.rect(surface, SHADOW_COLOR, button.move(5, 5), border_radius=radius)  # Create shadow effect
+    pygame.draw.rect(surface, color, button, border_radius=radius)
+    pygame.draw.rect(surface, border_color, button, width=border_width, border_radius=radius)
+    text_surface = render_text(text, font, BLACK)
+    surface.blit(text_surface, ((button.width - text_surface.get_width()) // 2, (button.height - text_surface.get_height()) // 2))
+    return surface
+
+# Function to build an outline drawn around an item for feedback
+highlight_surfaces = {}
+def make_highlight_surface(color, rect):
+    key = (color, rect.size)
+    if key not in highlight_surfaces:
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(surface, color, surface.get_rect(), 5)
+        highlight_surfaces[key] = surface
+    return highlight_surfaces[key]
+
+# Function to lay out the current category's items and buttons in the scene
+def build_scene():
+    global scene_category, grid, grid_images
+    animator.cancel()
+    scene.clear()
+    visible_items.clear()
+    item_offsets.clear()
+    # The scene draws straight from the category's images, so it stays pinned
+    # while it is shown; a prefetch going over budget evicts other categories
+    assets.pin(current_category)
+    if scene_category is not None:
+        assets.unpin(scene_category)
+    grid_images = assets.load(current_category).images  # Already scaled and converted
+    assets.load('feedback')
+
+    grid_items[:] = shown_items(current_category)
+    grid_index.clear()
+    grid_index.update((item, index) for index, item in enumerate(grid_items))
+    grid = GridLayout(len(grid_items), ITEM_SIZE, (170, 150), item_viewport, (100, 100))
+    scroll.reset(grid)
+
+    font = get_font('arial', 50)
+    scene.set('back', make_button_surface(back_button, 'Back', font, LIGHT_BLUE, DARK_BLUE, 3, 10), back_button.topleft)
+    scene.set('replay', make_button_surface(replay_button, 'Replay', font, LIGHT_BLUE, DARK_BLUE, 3, 10), replay_button.topleft)
+    scene_category = current_category
 
 # Function to draw items on the screen (using images)
 def draw_items(dancing=False):
-    if background_img:
-        screen.blit(background_img, (0, 0))
-    else:
-        screen.fill(WHITE)
-    letter_positions.clear()
-    x, y = 100, 100
-    items = []
-    if current_category == 'letters':
-        items = letters
-        images = letter_images
-    elif current_category == 'numbers':
-        items = numbers
-        images = number_images
-    elif current_category == 'words':
-        items = words
-        images = word_images
-    elif current_category == 'who':
-        items = who_items
-        images = who_images
-
-    for item in items:
-        if item in images:
-            offset = random.randint(-10, 10) if dancing else 0
-            item_img = images[item]
-            item_img = pygame.transform.scale(item_img, (120, 120))  # Scale to appropriate size
-            item_rect = item_img.get_rect(center=(x, y + offset))
-            screen.blit(item_img, item_rect)
-            letter_positions.append((item, item_rect))
-            x += 170
-            if x > WIDTH - 100:
-                x = 100
-                y += 150
-
-    # Draw Back Button
-    font = pygame.font.Font(pygame.font.match_font('arial'), 50)
-    back_button = pygame.Rect(50, 800, 150, 50)
-    shadow_back = back_button.move(5, 5)
-    pygame.draw.rect(screen, SHADOW_COLOR, shadow_back, border_radius=10)
-    pygame.draw.rect(screen, LIGHT_BLUE, back_button, border_radius=10)
-    pygame.draw.rect(screen, DARK_BLUE, back_button, width=3, border_radius=10)
-    text_back = font.render('Back', True, BLACK)
-    screen.blit(text_back, (back_button.x + (back_button.width - text_back.get_width()) // 2, back_button.y + (back_button.height - text_back.get_height()) // 2))
-
-    # Draw Replay Button
-    replay_button = pygame.Rect(1000, 800, 150, 50)
-    shadow_replay = replay_button.move(5, 5)
-    pygame.draw.rect(screen, SHADOW_COLOR, shadow_replay, border_radius=10)
-    pygame.draw.rect(screen, LIGHT_BLUE, replay_button, border_radius=10)
-    pygame.draw.rect(screen, DARK_BLUE, replay_button, width=3, border_radius=10)
-    text_replay = font.render('Replay', True, BLACK)
-    screen.blit(text_replay, (replay_button.x + (replay_button.width - text_replay.get_width()) // 2, replay_button.y + (replay_button.height - text_replay.get_height()) // 2))
-
-    pygame.display.update()
+    if scene_category != current_category:
+        build_scene()
+    if dancing:
+        shuffle_item_offsets()
+    offset = scroll.offset
+    shown = set()
+    for index in grid.visible_range(offset):
+        item = grid_items[index]
+        rect = grid.rect(index)
+        scene.set(('item', item.index), grid_images[item.index], (rect.x, rect.y - offset + item_offsets.get(item, 0)), clip=item_viewport)
+        shown.add(item)
+    for item in visible_items - shown:
+        scene.remove(('item', item.index))
+    visible_items.clear()
+    visible_items.update(shown)
+    overlay = profiler.overlay_surface()
+    if overlay is not None:
+        scene.set('profiler', overlay, (10, 10), layer=10)
+    elif 'profiler' in scene:
+        scene.remove('profiler')
+    rects = scene.render(update=False)
+    profiler.mark('render')
+    if rects:
+        pygame.display.update(rects)
+    profiler.mark('display')
     return back_button, replay_button
 
-# Function to animate correct item
-def animate_correct_item(item_rect):
-    for i in range(5):
-        pygame.draw.rect(screen, GREEN, item_rect.inflate(20, 20), 5)
-        pygame.display.update()
-        pygame.time.delay(100)
-        draw_items()
-        pygame.display.update()
-        pygame.time.delay(100)
+# Function to give every item a random vertical offset (used for dancing)
+def shuffle_item_offsets():
+    for item in visible_items:
+        item_offsets[item] = random.randint(-10, 10)
+
+# Function to show or hide the feedback outline around an item
+def set_highlight(color, item_rect):
+    if color is None:
+        scene.remove('highlight')
+    else:
+        outline = grid.to_screen(item_rect, scroll.offset).inflate(20, 20)
+        scene.set('highlight', make_highlight_surface(color, outline), outline.topleft, layer=1, clip=item_viewport)
+
+# Animation that flashes an outline around an item `times` times (200 ms per flash)
+def flash_animation(color, item_rect, times):
+    def update(t):
+        on = int(t * times * 2) % 2 == 0 and t < 1.0
+        set_highlight(color if on else None, item_rect)
+    return Tween(times * 200, update, on_stop=lambda: set_highlight(None, item_rect))
+
+# Animation that moves an arrow from one item towards another
+def arrow_animation(item_rect, current_item_rect):
+    arrow_img = assets.load('feedback').images.get('arrow')
+    start_pos = item_rect.center
+    target_pos = current_item_rect.center
+    angle = math.degrees(math.atan2(target_pos[1] - start_pos[1], target_pos[0] - start_pos[0]))
+    rotated_arrow = pygame.transform.rotate(arrow_img, -angle)
+
+    def update(t):
+        # Follow the grid if it scrolls while the arrow is moving
+        offset = scroll.offset
+        arrow_pos = ((1 - t) * start_pos[0] + t * target_pos[0], (1 - t) * start_pos[1] + t * target_pos[1] - offset)
+        scene.set('arrow', rotated_arrow, rotated_arrow.get_rect(center=arrow_pos).topleft, layer=2, clip=item_viewport)
+    return Tween(1500, update, easing=ease_in_out_quad, on_stop=lambda: scene.remove('arrow'))
+
+# Animation that makes the items dance, re-shuffling their offsets every 100 ms
+def dancing_animation(duration=2000):
+    steps = []
+
+    def update(t):
+        step = int(t * duration) // 100
+        if step not in steps:
+            steps.append(step)
+            shuffle_item_offsets()
+    return Tween(duration, update, on_stop=item_offsets.clear)
+
+# Function to animate correct item: flash it, then make the items dance
+def animate_correct_item(item_rect, on_complete=None):
+    return animator.add(Sequence([flash_animation(GREEN, item_rect, 5), dancing_animation()], on_complete=on_complete))
 
 # Function to give feedback when wrong item is selected
 def animate_wrong_item(item_rect, current_item_rect):
-    for i in range(3):
-        pygame.draw.rect(screen, RED, item_rect.inflate(20, 20), 5)
-        pygame.display.update()
-        pygame.time.delay(100)
-        draw_items()
-        pygame.display.update()
-        pygame.time.delay(100)
-
+    animations = [flash_animation(RED, item_rect, 3)]
     # Animate an arrow moving towards the correct item
-    if current_item_rect:  # Ensure current_item_rect exists
-        arrow_pos = list(item_rect.center)
-        target_pos = current_item_rect.center
-        step_count = 30
-        for step in range(step_count):
-            draw_items()
-            t = step / step_count
-            arrow_pos[0] = (1 - t) * item_rect.center[0] + t * target_pos[0]
-            arrow_pos[1] = (1 - t) * item_rect.center[1] + t * target_pos[1]
-            angle = math.degrees(math.atan2(target_pos[1] - arrow_pos[1], target_pos[0] - arrow_pos[0]))
-            rotated_arrow = pygame.transform.rotate(arrow_img, -angle)
-            arrow_rect = rotated_arrow.get_rect(center=arrow_pos)
-            screen.blit(rotated_arrow, arrow_rect)
-            pygame.display.update()
-            pygame.time.delay(50)
+    if current_item_rect and 'arrow' in assets.load('feedback').images:  # Ensure current_item_rect exists
+        animations.append(arrow_animation(item_rect, current_item_rect))
+    return animator.add(Sequence(animations))
 
 # Function to make items dance
 def animate_dancing_items():
-    for _ in range(20):  # Make the items dance for a short duration
-        draw_items(dancing=True)
-        pygame.time.delay(100)
+    return animator.add(dancing_animation())
 
 # Function to play prompt sound without overlapping
 def play_prompt_sound(current_item):
     if not SOUND_ENABLED:
         return
-    # Play general prompt sound first if applicable
-    if current_category == 'letters' and 'find_the_letter' in sounds:
-        sound_queue.put(sounds['find_the_letter'])
-    elif current_category == 'numbers' and 'find_the_number' in sounds:
-        sound_queue.put(sounds['find_the_number'])
-    elif current_category == 'who' and 'find_whos_sound' in sounds:
-        sound_queue.put(sounds['find_whos_sound'])
-    
-    # Wait for the general prompt to finish before playing the specific item sound
-    while pygame.mixer.get_busy():
-        pygame.time.delay(100)  # Wait 100ms while a sound is playing
-    
-    # Play specific item sound
-    if current_category == 'numbers' and current_item in numbers:
-        try:
-            sound_queue.put(sounds[f'prompt_{numbers.index(current_item) + 1}'])
-        except KeyError:
-            print(f"Sound for number {current_item} not found, skipping.")
-    elif current_category == 'who' and current_item in who_sounds:
-        sound_queue.put(who_sounds[current_item])
-    elif f'prompt_{current_item}' in sounds:
-        try:
-            sound_queue.put(sounds[f'prompt_{current_item}'])
-        except KeyError:
-            print(f"Sound for {current_item} not found, skipping.")
+    category = assets.load(current_category)
+    # General prompt first if applicable, then the specific item sound
+    play_sounds_sequence(category.prompt, category.sounds.get(current_item.index))
+
+# Function to play a random correct or wrong feedback sound, cutting off any prompt
+def play_feedback_sound(kind):
+    sounds = feedback_sounds(kind)
+    if sounds:
+        sequencer.play([random.choice(sounds)], FEEDBACK)
 
 
-# Main game loop
-def main():
+# Function to run the game: show the menu as soon as its assets are in, then
+# stream the categories in behind it. init() must have been called (main() does both).
+# It is a coroutine so the pygbag web build can yield to the browser every frame.
+async def run():
     global current_category
+    await load_menu()
     running = True
-    clock = pygame.time.Clock()
+    # Full rate while something moves; otherwise wait for input (see pacer.py)
+    pacer = FramePacer(event_source, 30)
 
     # Show initial menu with buttons
-    button_1, button_2, button_3 = draw_buttons()
+    menu_buttons = draw_buttons()
+
+    # Load the categories in the background while the menu is up
+    prefetch = assets.prefetch('feedback', *(category.id for category in content.menu_categories()))
 
     category_selected = False
     current_item = None
-    used_items = set()
+    store = default_store()
 
     while running:
-        play_sound_from_queue()
+        profiler.begin_frame()
+        events = event_source.get(pacer.wait_ms)
+        profiler.mark('idle')
         if not category_selected:
             # Event handling for selecting category
-            for event in pygame.event.get():
+            for event in events:
+                if sequencer.handle_event(event) or profiler.handle_event(event):
+                    continue
+                if event.type in USER_GESTURES:
+                    ensure_audio()
                 if event.type == pygame.QUIT:
                     running = False
+                if event.type == pygame.WINDOWEXPOSED:
+                    menu_buttons = draw_buttons()
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     mouse_pos = event.pos
-                    if button_1.collidepoint(mouse_pos):
-                        current_category = 'letters'
-                        used_items.clear()
-                        current_item = random.choice([item for item in letters if item not in used_items])
-                        used_items.add(current_item)
-                        play_prompt_sound(current_item)
-                        category_selected = True
-                    elif button_2.collidepoint(mouse_pos):
-                        current_category = 'numbers'
-                        used_items.clear()
-                        current_item = random.choice([item for item in numbers if item not in used_items])
-                        used_items.add(current_item)
-                        play_prompt_sound(current_item)
-                        category_selected = True
-                    elif button_3.collidepoint(mouse_pos):
-                        current_category = 'who'
-                        used_items.clear()
-                        current_item = random.choice([item for item in who_items if item not in used_items])
-                        used_items.add(current_item)
-                        play_prompt_sound(current_item)
-                        category_selected = True
+                    for category_id, button in menu_buttons:
+                        if button.collidepoint(mouse_pos):
+                            current_category = category_id
+                            await assets.load_async(current_category)
+                            current_item = next_item(current_category)
+                            if current_item is None:
+                                break  # None of the category's images could be loaded; stay on the menu
+                            play_prompt_sound(current_item)
+                            category_selected = True
+                            break
         else:
-            back_button, replay_button = draw_items()
-
             # Event handling for game interaction
-            for event in pygame.event.get():
+            for event in events:
+                if sequencer.handle_event(event) or profiler.handle_event(event):
+                    continue
+                if event.type in USER_GESTURES:
+                    ensure_audio()
                 if event.type == pygame.QUIT:
                     running = False
-                if event.type == pygame.MOUSEBUTTONDOWN:
+                if event.type == pygame.WINDOWEXPOSED:
+                    scene.invalidate()
+                if event.type == pygame.MOUSEWHEEL:
+                    scroll.scroll_by(-event.y * 75)  # Half a row per wheel step
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 2, 3):
                     mouse_pos = event.pos
                     if back_button.collidepoint(mouse_pos):
+                        animator.cancel()
+                        sequencer.cancel()
                         category_selected = False
-                        button_1, button_2, button_3 = draw_buttons()
+                        if not store.background:
+                            store.flush()  # Commits now where there is no writer thread (web)
+                        scene.invalidate()  # The menu draws over the whole window
+                        menu_buttons = draw_buttons()
                     elif replay_button.collidepoint(mouse_pos):
                         play_prompt_sound(current_item)  # Replay the current prompt sound
                     else:
+                        # A new click interrupts the running feedback animation
+                        animator.finish()
                         # Check if the clicked item is correct
-                        for item, rect in letter_positions:
-                            if rect.collidepoint(mouse_pos):
-                                if item == current_item:
-                                    if correct_sounds:
-                                        random.choice(correct_sounds).play()
-                                    animate_correct_item(rect)
-                                    animate_dancing_items()
-                                    remaining_items = [item for item in (letters if current_category == 'letters' else numbers if current_category == 'numbers' else who_items if current_category == 'who' else words) if item not in used_items]
-                                    if remaining_items:
-                                        current_item = random.choice(remaining_items)
-                                        used_items.add(current_item)
-                                        play_prompt_sound(current_item)
-                                    else:
-                                        used_items.clear()
-                                        current_item = random.choice(letters if current_category == 'letters' else numbers if current_category == 'numbers' else who_items if current_category == 'who' else words)
-                                        used_items.add(current_item)
-                                        play_prompt_sound(current_item)
-                                else:
-                                    if wrong_sounds:
-                                        random.choice(wrong_sounds).play()
-                                    # Get the correct item rect for arrow animation
-                                    current_item_rect = [r for l, r in letter_positions if l == current_item]
-                                    if current_item_rect:
-                                        animate_wrong_item(rect, current_item_rect[0])
-
-        # Refresh the screen
-        pygame.display.flip()
-        clock.tick(30)
+                        index = grid.hit_test(mouse_pos, scroll.offset)
+                        if index is not None:
+                            item = grid_items[index]
+                            rect = grid.rect(index)
+                            # Answers count against the item that was asked for
+                            store.record_answer(current_category, current_item.id, item == current_item)
+                            get_scheduler(current_category).record(item == current_item)
+                            if item == current_item:
+                                play_feedback_sound('correct')
+                                current_item = next_item(current_category)
+                                # Prompt for the next item once the celebration is over
+                                animate_correct_item(rect, on_complete=lambda next_item=current_item: play_prompt_sound(next_item))
+                            else:
+                                play_feedback_sound('wrong')
+                                # Scroll the correct item into view and point the arrow at it
+                                target = grid_index.get(current_item)
+                                if target is not None:
+                                    scroll.scroll_to(grid.scroll_into_view(target, scroll.target))
+                                    animate_wrong_item(rect, grid.rect(target))
+
+        profiler.mark('events')
+
+        if category_selected:
+            now = event_source.ticks()
+            animator.tick(now)
+            scroll.update(now)
+            profiler.mark('animation')
+            draw_items()
 
+        event_source.end_frame((category_selected, current_category, current_item.id if current_item else None,
+                                round(scroll.offset), animator.busy))
+        # draw_buttons() and the scene push their own display updates
+        active = (category_selected and (animator.busy or scroll.moving)) or not prefetch.done()
+        pacer.end_frame(active, wake_in=500 if profiler.overlay_visible else None)  # The overlay refreshes twice a second
+        await asyncio.sleep(pacer.sleep_s)
+        profiler.mark('idle')
+
+    if os.environ.get('ZAID_SPRITE_STATS'):
+        print(f"Sprite cache: {sprites.stats()}")
+    if profiler.enabled:
+        print(f"Frame pacing: {pacer.report()}")  # Session CPU time and average fps
+    profiler.close()
     pygame.quit()
 
+# Entry point for main.py and the web build
+async def main():
+    init()
+    await run()
+
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
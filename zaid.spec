@@ -1,11 +1,13 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# Run `python build_assets.py` first: the frozen app reads every image and
+# sound from bundle/assets.pak, and its categories from packs/.
 
 a = Analysis(
     ['zaid.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('bundle/assets.pak', 'bundle'), ('packs', 'packs')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},